@@ -1,47 +1,445 @@
 import os
 import sys
+import codecs
 import json
-import subprocess
+import queue
+import time
+import hashlib
 import threading
-from shutil import copy2, move
+from shutil import move
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+
+# Marco zero do tempo de inicialização (antes de importar o Qt)
+INICIO = time.perf_counter()
+
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QLineEdit, QPushButton,
-    QScrollArea, QMessageBox, QFileDialog, QInputDialog, QHBoxLayout,
+    QMessageBox, QFileDialog, QInputDialog, QHBoxLayout,
     QMenu, QDialog, QLabel, QTextEdit, QCheckBox, QComboBox,
-    QProgressBar, QSplashScreen, QFrame, QSizePolicy, QSystemTrayIcon
+    QProgressBar, QSplashScreen, QFrame, QSystemTrayIcon,
+    QListView, QStyledItemDelegate, QStyle, QSpinBox, QDoubleSpinBox, QPlainTextEdit,
+    QProgressDialog
+)
+from PySide6.QtGui import (
+    QIcon, QAction, QPixmap, QColor, QCursor, QImage, QFont, QPainter, QPen
 )
-from PySide6.QtGui import QIcon, QAction, QPixmap, QColor, QCursor, QImage
-from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtCore import (
+    Qt, QThread, Signal, QTimer, QFileSystemWatcher, QMutex, QMutexLocker,
+    QAbstractListModel, QModelIndex, QRect, QRectF, QSize
+)
+
+from libby_core.cron import ScheduleQueue, parse_schedule
+from libby_core.dedup import ContentStore
+from libby_core.history import RunHistory
+from libby_core.importer import IGNORE_GLOBS, IMPORT_DEPTH, import_folder
+from libby_core.logs import log_path_for
+from libby_core.paths import CACHE_DIR
+from libby_core.process import ProcessSupervisor
+from libby_core.resources import ResourceSampler
+from libby_core.scheduler import DEFAULT_LIMITS, LaunchScheduler
+from libby_core.scanner import CategoryScan, HubScanner, HubSnapshot
+from libby_core.search import SearchIndex
+from libby_core.snapshot import load_snapshot, save_snapshot
+from libby_core.store import DebouncedWriter, open_store
 
 # Caminho da pasta de assets (relativo ao script)
 ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
 
-# Caminho da pasta de config no AppData
-APPDATA_DIR = os.path.join(os.environ.get("APPDATA", os.path.expanduser("~")), "MeuHub")
-CONFIG_FILE = os.path.join(APPDATA_DIR, "config.json")
-CACHE_DIR = os.path.join(APPDATA_DIR, "icon_cache")
+
+def area_opaca(img):
+    """QRect da área não transparente da imagem, ou None se ela for toda transparente.
+
+    Lê o buffer inteiro de uma vez e procura o alfa linha a linha com
+    fatias de bytes, sem uma chamada ao Qt por pixel.
+    """
+    img = img.convertToFormat(QImage.Format_RGBA8888)
+    w, h, stride = img.width(), img.height(), img.bytesPerLine()
+    dados = bytes(img.constBits())[:stride * h]
+    left, right, top, bottom = w, -1, None, None
+    for y in range(h):
+        inicio = y * stride
+        # RGBA8888 guarda os bytes como R, G, B, A em qualquer arquitetura
+        alpha = dados[inicio + 3:inicio + w * 4:4]
+        resto = alpha.lstrip(b"\0")
+        if not resto:
+            continue
+        if top is None:
+            top = y
+        bottom = y
+        left = min(left, w - len(resto))
+        right = max(right, len(alpha.rstrip(b"\0")) - 1)
+    if top is None:
+        return None
+    return QRect(left, top, right - left + 1, bottom - top + 1)
+
+
+def carregar_asset(nome, tamanho=None, recortar=False):
+    """QPixmap de um arquivo de assets, recortado nas margens transparentes e/ou reduzido.
+
+    O resultado vai para o CACHE_DIR indexado por (arquivo, mtime, tamanho,
+    recorte); nas próximas aberturas só o PNG pronto é lido.
+    """
+    origem = os.path.join(ASSETS_DIR, nome)
+    try:
+        mtime = os.stat(origem).st_mtime_ns
+    except OSError:
+        return QPixmap()
+    chave = f"{nome}|{mtime}|{tamanho}|{recortar}"
+    cached = os.path.join(CACHE_DIR, "asset_" + hashlib.sha1(chave.encode("utf-8")).hexdigest() + ".png")
+    pixmap = QPixmap(cached)
+    if not pixmap.isNull():
+        return pixmap
+
+    img = QImage(origem)
+    if img.isNull():
+        return QPixmap()
+    if recortar:
+        area = area_opaca(img)
+        if area is not None and area.width() > 1 and area.height() > 1:
+            img = img.copy(area)
+    if tamanho:
+        img = img.scaled(tamanho, tamanho, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        temp = cached + ".tmp"
+        if img.save(temp, "PNG"):
+            os.replace(temp, cached)
+    except OSError:
+        pass
+    return QPixmap.fromImage(img)
+
+# Folha de estilo única da aplicação; o tema vem da propriedade 'tema' da janela
+TEMA_QSS = """
+*[tema], *[tema] QWidget {
+    font-family: 'Segoe UI', Arial;
+}
+*[tema] QLineEdit {
+    padding: 8px 12px;
+    border-radius: 6px;
+}
+*[tema] QLineEdit:focus {
+    border: 1px solid #0078d4;
+}
+*[tema] QPushButton {
+    color: white;
+    border: none;
+    padding: 8px 14px;
+    border-radius: 6px;
+    font-weight: 500;
+}
+*[tema] QGroupBox {
+    font-weight: 600;
+    font-size: 13px;
+    border: none;
+    border-radius: 8px;
+    margin-top: 8px;
+    padding-top: 16px;
+}
+*[tema] QGroupBox::title {
+    subcontrol-origin: margin;
+    left: 12px;
+    padding: 0 8px;
+    color: #0078d4;
+}
+*[tema] QScrollArea {
+    border: none;
+    background-color: transparent;
+}
+*[tema] QComboBox {
+    padding: 6px 10px;
+    border-radius: 6px;
+}
+*[tema] QComboBox:hover {
+    border: 1px solid #0078d4;
+}
+*[tema] QComboBox::drop-down {
+    border: none;
+    padding-right: 8px;
+}
+*[tema] QProgressBar {
+    border: none;
+}
+*[tema] QProgressBar::chunk {
+    background-color: #0078d4;
+}
+
+*[tema="dark"], *[tema="dark"] QWidget {
+    background-color: #1a1a2e;
+    color: #eaeaea;
+}
+*[tema="dark"] QFrame {
+    background-color: #1a1a2e;
+}
+*[tema="dark"] QLineEdit, *[tema="dark"] QComboBox {
+    background-color: #16213e;
+    border: 1px solid #0f3460;
+    color: #eaeaea;
+}
+*[tema="dark"] QPushButton {
+    background-color: #0f3460;
+}
+*[tema="dark"] QPushButton:hover {
+    background-color: #0078d4;
+}
+*[tema="dark"] QGroupBox, *[tema="dark"] QProgressBar {
+    background-color: #16213e;
+}
+
+*[tema="light"], *[tema="light"] QWidget {
+    background-color: #f5f7fa;
+    color: #2d3436;
+}
+*[tema="light"] QFrame {
+    background-color: #ffffff;
+}
+*[tema="light"] QLineEdit, *[tema="light"] QComboBox {
+    background-color: #ffffff;
+    border: 1px solid #dfe6e9;
+}
+*[tema="light"] QPushButton {
+    background-color: #0078d4;
+}
+*[tema="light"] QPushButton:hover {
+    background-color: #106ebe;
+}
+*[tema="light"] QGroupBox {
+    background-color: #ffffff;
+}
+*[tema="light"] QProgressBar {
+    background-color: #dfe6e9;
+}
+/* Depois do :hover dos temas, para prevalecer ao clicar */
+*[tema] QPushButton:pressed {
+    background-color: #005a9e;
+}
+
+QLabel#titulo {
+    font-size: 18px;
+    font-weight: bold;
+    color: #0078d4;
+}
+QLabel#status {
+    padding-left: 16px;
+    color: #666;
+    font-size: 11px;
+}
+QPushButton#botaoFila {
+    padding: 2px 10px;
+    font-size: 11px;
+}
+QLabel#caminhoLog {
+    color: #888;
+    font-size: 10px;
+}
+"""
+
 
 class IconLoader(QThread):
-    """Thread para carregar ícones de forma assíncrona"""
-    icon_loaded = Signal(str, QIcon)
-    
-    def __init__(self, file_paths):
-        super().__init__()
-        self.file_paths = file_paths
-        
+    """Thread que decodifica ícones fora da interface, com cache em disco no CACHE_DIR"""
+    icon_loaded = Signal(str, QImage, str)  # origem, imagem, PNG do cache
+
+    ICON_SIZE = 28
+
+    def __init__(self, cache_dir, parent=None):
+        super().__init__(parent)
+        self.cache_dir = cache_dir
+        self._queue = queue.Queue()
+
+    def request(self, path):
+        self._queue.put(path)
+
+    def stop(self):
+        self._queue.put(None)
+        self.wait()
+
+    def cache_path(self, path, stat):
+        """PNG do cache indexado por (caminho de origem, mtime, tamanho)"""
+        chave = f"{os.path.normcase(os.path.abspath(path))}|{stat.st_mtime_ns}|{self.ICON_SIZE}"
+        return os.path.join(self.cache_dir, hashlib.sha1(chave.encode("utf-8")).hexdigest() + ".png")
+
     def run(self):
-        for path in self.file_paths:
+        while True:
+            path = self._queue.get()
+            if path is None:
+                break
             try:
-                icon = QIcon(path)
-                if not icon.isNull():
-                    self.icon_loaded.emit(path, icon)
-                else:
-                    # Ícone padrão se não conseguir carregar
-                    default_icon = QIcon.fromTheme("application-x-executable")
-                    self.icon_loaded.emit(path, default_icon)
+                image, cached = self._load(path)
             except Exception:
-                continue
+                image, cached = QImage(), ""
+            # Imagem nula indica que a linha deve manter o placeholder
+            self.icon_loaded.emit(path, image, cached)
+
+    def _load(self, path):
+        cached = self.cache_path(path, os.stat(path))
+        image = QImage(cached)
+        if not image.isNull():
+            return image, cached
+
+        image = QImage(path)
+        if image.isNull():
+            return image, ""
+        image = image.scaled(self.ICON_SIZE, self.ICON_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        temp = cached + ".tmp"
+        if not image.save(temp, "PNG"):
+            return image, ""
+        os.replace(temp, cached)
+        return image, cached
+
+class DirectoryPoller(QThread):
+    """Thread que compara o mtime de pastas quando o QFileSystemWatcher não funciona"""
+    directories_changed = Signal(list)
+
+    def __init__(self, parent=None, interval_ms=700):
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self._mutex = QMutex()
+        self._mtimes = {}
+
+    def paths(self):
+        with QMutexLocker(self._mutex):
+            return list(self._mtimes)
+
+    def set_paths(self, paths):
+        with QMutexLocker(self._mutex):
+            self._mtimes = {path: self._mtimes.get(path, self._mtime(path)) for path in paths}
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def run(self):
+        while not self.isInterruptionRequested():
+            self.msleep(self.interval_ms)
+            with QMutexLocker(self._mutex):
+                paths = list(self._mtimes.items())
+            alteradas = []
+            for path, mtime in paths:
+                atual = self._mtime(path)
+                if atual != mtime:
+                    alteradas.append(path)
+                    with QMutexLocker(self._mutex):
+                        if path in self._mtimes:
+                            self._mtimes[path] = atual
+            if alteradas:
+                self.directories_changed.emit(alteradas)
+
+    def stop(self):
+        self.requestInterruption()
+        self.wait()
+
+
+class ScanWorker(QThread):
+    """Varre o Hub em background com um scanner próprio (entregue junto com o resultado).
+
+    Com um snapshot salvo (snapshot, logos), só relê as categorias cujo mtime mudou.
+    """
+    scanned = Signal(int, object, object)  # geração, scanner, snapshot
+    failed = Signal(int, str)
+
+    def __init__(self, hub_dir, generation, previous=None, parent=None):
+        super().__init__(parent)
+        self.hub_dir = hub_dir
+        self.generation = generation
+        self.previous = previous
+
+    def run(self):
+        scanner = HubScanner(self.hub_dir)
+        try:
+            if self.previous is None:
+                snapshot = scanner.scan()
+            else:
+                scanner.restore(*self.previous)
+                snapshot = scanner.revalidate(self.previous[0])
+        except Exception as e:
+            self.failed.emit(self.generation, str(e))
+            return
+        self.scanned.emit(self.generation, scanner, snapshot)
+
+
+class ImportWorker(QThread):
+    """Importa uma pasta externa em background; o importer divide os itens num pool"""
+    progress = Signal(int, int)  # feitos, total
+    imported = Signal(int, object, object, object)  # importados, metadados, falhas, duplicados
+    failed = Signal(str)
+
+    def __init__(self, pasta, hub_dir, categoria, store, options=None, parent=None):
+        super().__init__(parent)
+        self.pasta = pasta
+        self.hub_dir = hub_dir
+        self.categoria = categoria
+        self.store = store
+        self.options = options or {}
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        try:
+            resultado = import_folder(
+                self.pasta, self.hub_dir, self.categoria, store=self.store,
+                cancel=self._cancel, progress=self.progress.emit, **self.options
+            )
+        except Exception as e:
+            # Qualquer erro precisa chegar à interface, senão a importação fica "em andamento"
+            self.failed.emit(str(e))
+            return
+        self.imported.emit(*resultado)
+
+
+class AddWorker(QThread):
+    """Coloca um arquivo no Hub pelo ContentStore (o hash de .exe grandes fica fora da interface)"""
+    added = Signal(object)  # StoreResult
+    failed = Signal(str)
+
+    def __init__(self, store, source, destino, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.source = source
+        self.destino = destino
+
+    def run(self):
+        try:
+            resultado = self.store.add(self.source, self.destino)
+            self.store.save()
+        except OSError as e:
+            self.failed.emit(str(e))
+            return
+        self.added.emit(resultado)
+
+
+class SearchWorker(QThread):
+    """Thread que consulta o SearchIndex; só a busca mais recente é respondida"""
+    results_ready = Signal(int, list)
+
+    def __init__(self, index, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self._queue = queue.Queue()
+
+    def request(self, generation, texto):
+        self._queue.put((generation, texto))
+
+    def stop(self):
+        self._queue.put(None)
+        self.wait()
+
+    def run(self):
+        while True:
+            pedido = self._queue.get()
+            # Descarta pedidos que já foram superados na fila
+            while pedido is not None and not self._queue.empty():
+                pedido = self._queue.get()
+            if pedido is None:
+                break
+            generation, texto = pedido
+            self.results_ready.emit(generation, self.index.search(texto))
+
 
 # --- dentro da classe EditProgramDialog ---
 class EditProgramDialog(QDialog):
@@ -87,6 +485,17 @@ class EditProgramDialog(QDialog):
         self.favorite_check.setChecked(program_info.get('favorite', False))
         layout.addWidget(self.favorite_check)
 
+        # Captura de saída
+        self.capture_check = QCheckBox("Capturar saída em log")
+        self.capture_check.setChecked(program_info.get('capture_output', False))
+        layout.addWidget(self.capture_check)
+
+        # Agendamento (cron de 5 colunas ou @every)
+        layout.addWidget(QLabel("Agendamento:"))
+        self.schedule_edit = QLineEdit(program_info.get('schedule', ''))
+        self.schedule_edit.setPlaceholderText("ex.: 0 8 * * 1-5  ou  @every 30m (vazio = sem agendamento)")
+        layout.addWidget(self.schedule_edit)
+
         # Ícone personalizado
         layout.addWidget(QLabel("Ícone/Logo:"))
         self.icon_path_edit = QLineEdit(program_info.get('icon', ''))
@@ -112,6 +521,16 @@ class EditProgramDialog(QDialog):
         button_layout.addWidget(self.cancel_btn)
         layout.addLayout(button_layout)
 
+    def accept(self):
+        texto = self.schedule_edit.text().strip()
+        if texto:
+            try:
+                parse_schedule(texto).next_after(datetime.now())
+            except ValueError as e:
+                QMessageBox.warning(self, "Agendamento inválido", str(e))
+                return
+        super().accept()
+
     def escolher_icone(self):
         arquivo, _ = QFileDialog.getOpenFileName(
             self, "Escolher ícone", "", "Imagens (*.png *.ico *.jpg);;Todos (*.*)"
@@ -125,244 +544,725 @@ class EditProgramDialog(QDialog):
             'display_name': self.name_edit.text(),
             'description': self.desc_edit.toPlainText(),
             'favorite': self.favorite_check.isChecked(),
+            'capture_output': self.capture_check.isChecked(),
+            'schedule': " ".join(self.schedule_edit.text().split()),
             'icon': self.icon_path_edit.text(),
             'tags': tags
         }
 
 
-class ListItem(QFrame):
-    """Item de lista para programa"""
-    clicked = Signal()
-    rightClicked = Signal()
+class LaunchLimitsDialog(QDialog):
+    """Dialog para configurar quantos programas podem rodar ao mesmo tempo"""
 
-    # Cores das tags
-    TAG_COLORS = {
-        "trabalho": "#3498db",
-        "pessoal": "#9b59b6",
-        "urgente": "#e74c3c",
-        "teste": "#f39c12",
-        "producao": "#27ae60"
-    }
-
-    def __init__(self, nome, descricao="", tipo="", last_run="", tags=None, parent=None):
+    def __init__(self, limits, parent=None):
         super().__init__(parent)
-        self.nome = nome
-        self.is_favorite = False
-        self.is_dark_theme = False
-        self.is_running = False
-        self.tags = tags or []
-        self.caminho = ""
-        self.setCursor(Qt.PointingHandCursor)
-        self.setFixedHeight(44)
-        self.setAcceptDrops(True)
+        self.setWindowTitle("Limites de Execução")
+        self.setModal(True)
+        self.resize(380, 300)
 
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(10, 6, 10, 6)
-        layout.setSpacing(8)
+        layout = QVBoxLayout(self)
+        layout.setSpacing(12)
 
-        # Indicador de execucao
-        self.running_indicator = QLabel()
-        self.running_indicator.setFixedSize(8, 8)
-        self.running_indicator.setVisible(False)
-        layout.addWidget(self.running_indicator)
+        # Limite global
+        layout.addWidget(QLabel("Máximo de programas simultâneos:"))
+        self.max_spin = QSpinBox()
+        self.max_spin.setRange(0, 64)
+        self.max_spin.setSpecialValueText("Sem limite")
+        self.max_spin.setValue(limits.get('max_running', 0))
+        layout.addWidget(self.max_spin)
+
+        # Intervalo entre lançamentos
+        layout.addWidget(QLabel("Intervalo mínimo entre lançamentos (s):"))
+        self.interval_spin = QDoubleSpinBox()
+        self.interval_spin.setRange(0, 600)
+        self.interval_spin.setSingleStep(0.5)
+        self.interval_spin.setValue(limits.get('interval', 0))
+        layout.addWidget(self.interval_spin)
+
+        # Limites por categoria e por tag, no formato "nome=2, outro=1"
+        layout.addWidget(QLabel("Por categoria (ex.: Financeiro=2):"))
+        self.category_edit = QLineEdit(self._formatar(limits.get('per_category', {})))
+        layout.addWidget(self.category_edit)
+
+        layout.addWidget(QLabel("Por tag (ex.: producao=1):"))
+        self.tag_edit = QLineEdit(self._formatar(limits.get('per_tag', {})))
+        layout.addWidget(self.tag_edit)
 
-        # Icone
-        self.icon_label = QLabel()
-        self.icon_label.setFixedSize(28, 28)
-        layout.addWidget(self.icon_label)
+        layout.addStretch()
 
-        # Nome
-        self.name_label = QLabel(nome)
-        self.name_label.setMinimumWidth(120)
-        layout.addWidget(self.name_label)
+        # Botões
+        button_layout = QHBoxLayout()
+        self.save_btn = QPushButton("Salvar")
+        self.cancel_btn = QPushButton("Cancelar")
 
-        # Tags container
-        self.tags_container = QHBoxLayout()
-        self.tags_container.setSpacing(4)
-        self.tags_container.setContentsMargins(0, 0, 0, 0)
-        layout.addLayout(self.tags_container)
+        self.save_btn.clicked.connect(self.accept)
+        self.cancel_btn.clicked.connect(self.reject)
 
-        # Descricao
-        self.desc_label = QLabel(descricao)
-        self.desc_label.setMinimumWidth(80)
-        layout.addWidget(self.desc_label, 1)
+        button_layout.addWidget(self.save_btn)
+        button_layout.addWidget(self.cancel_btn)
+        layout.addLayout(button_layout)
 
-        # Tipo (extensao)
-        self.type_label = QLabel(tipo)
-        self.type_label.setFixedWidth(40)
-        self.type_label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(self.type_label)
+    @staticmethod
+    def _formatar(limites):
+        return ", ".join(f"{nome}={valor}" for nome, valor in limites.items())
+
+    @staticmethod
+    def _interpretar(texto):
+        limites = {}
+        for parte in texto.split(","):
+            nome, _, valor = parte.partition("=")
+            nome = nome.strip()
+            if nome and valor.strip().isdigit() and int(valor) > 0:
+                limites[nome] = int(valor)
+        return limites
+
+    def get_limits(self):
+        return {
+            'max_running': self.max_spin.value(),
+            'interval': self.interval_spin.value(),
+            'per_category': self._interpretar(self.category_edit.text()),
+            'per_tag': self._interpretar(self.tag_edit.text())
+        }
 
-        # Ultima execucao
-        self.last_run_label = QLabel(last_run)
-        self.last_run_label.setFixedWidth(50)
-        self.last_run_label.setAlignment(Qt.AlignRight)
-        layout.addWidget(self.last_run_label)
 
-        # Indicador de favorito
-        self.fav_label = QLabel()
-        self.fav_label.setFixedWidth(16)
-        layout.addWidget(self.fav_label)
-
-        self._create_tag_labels()
-        self.update_style()
-
-    def _create_tag_labels(self):
-        # Limpa tags existentes
-        while self.tags_container.count():
-            item = self.tags_container.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-        # Cria novas tags
-        for tag in self.tags[:2]:  # Max 2 tags visiveis
-            tag_label = QLabel(tag)
-            tag_label.setFixedHeight(16)
-            color = self.TAG_COLORS.get(tag.lower(), "#888")
-            tag_label.setStyleSheet(f"font-size: 9px; color: white; background: {color}; border-radius: 3px; padding: 1px 4px;")
-            self.tags_container.addWidget(tag_label)
-
-    def set_tags(self, tags):
-        self.tags = tags or []
-        self._create_tag_labels()
+class LogTailDialog(QDialog):
+    """Acompanha o log de um programa enquanto ele roda (como tail -f)"""
 
-    def set_running(self, running):
-        self.is_running = running
-        self.running_indicator.setVisible(running)
-        self.update_style()
+    MAX_LINES = 5000
+    INITIAL_BYTES = 64 * 1024
+    MAX_READ = 256 * 1024  # por atualização; o excedente é pulado
 
-    def set_icon(self, icon):
-        if not icon.isNull():
-            pixmap = icon.pixmap(28, 28)
-            self.icon_label.setPixmap(pixmap)
+    def __init__(self, log_path, titulo, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Log - {titulo}")
+        self.resize(760, 480)
+        self.log_path = log_path
+        self.offset = None
+        self.inode = None
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
 
-    def set_favorite(self, is_favorite):
-        self.is_favorite = is_favorite
-        self.fav_label.setText("*" if is_favorite else "")
-        self.update_style()
+        layout = QVBoxLayout(self)
 
-    def set_theme(self, is_dark):
-        self.is_dark_theme = is_dark
-        self.update_style()
-
-    def update_style(self):
-        if self.is_dark_theme:
-            bg = "#16213e"
-            bg_hover = "#1a2744"
-            border_color = "#0f3460"
-            text_color = "#eaeaea"
-            secondary = "#888"
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setMaximumBlockCount(self.MAX_LINES)
+        self.text.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.text.setFont(QFont("Consolas", 9))
+        layout.addWidget(self.text)
+
+        # Botões
+        button_layout = QHBoxLayout()
+        path_label = QLabel(log_path)
+        path_label.setObjectName("caminhoLog")
+        button_layout.addWidget(path_label, 1)
+        self.clear_btn = QPushButton("Limpar")
+        self.close_btn = QPushButton("Fechar")
+        self.clear_btn.clicked.connect(self.text.clear)
+        self.close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(self.clear_btn)
+        button_layout.addWidget(self.close_btn)
+        layout.addLayout(button_layout)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.atualizar)
+        self.timer.start(500)
+        self.atualizar()
+
+    def atualizar(self):
+        """Lê só os bytes novos do arquivo (reinicia quando o log roda)"""
+        try:
+            st = os.stat(self.log_path)
+        except OSError:
+            return
+        if self.offset is None:
+            self.offset = max(0, st.st_size - self.INITIAL_BYTES)
+        elif st.st_ino != self.inode or st.st_size < self.offset:
+            self.offset = 0
+            self.text.appendPlainText("--- log rotacionado ---")
+        self.inode = st.st_ino
+        if st.st_size == self.offset:
+            return
+        if st.st_size - self.offset > self.MAX_READ:
+            self.offset = st.st_size - self.MAX_READ
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(self.offset)
+                data = f.read(st.st_size - self.offset)
+        except OSError:
+            return
+        self.offset += len(data)
+
+        scrollbar = self.text.verticalScrollBar()
+        no_fim = scrollbar.value() == scrollbar.maximum()
+        cursor = self.text.textCursor()
+        cursor.movePosition(cursor.MoveOperation.End)
+        cursor.insertText(self.decoder.decode(data))
+        if no_fim:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def done(self, result):
+        self.timer.stop()
+        super().done(result)
+
+
+class ProgramRow:
+    """Linha do modelo: cabeçalho de categoria ou programa"""
+    __slots__ = (
+        'kind', 'key', 'category', 'nome', 'descricao', 'tipo', 'last_run',
+        'tags', 'favorite', 'running', 'queued', 'usage', 'caminho', 'icon', 'icon_source', 'count', 'matches',
+        'collapsed'
+    )
+
+    CATEGORY = 0
+    PROGRAM = 1
+
+    def __init__(self, kind, category, nome="", key="", caminho="", descricao="",
+                 tipo="", last_run="", tags=None, favorite=False):
+        self.kind = kind
+        self.key = key
+        self.category = category
+        self.nome = nome
+        self.descricao = descricao
+        self.tipo = tipo
+        self.last_run = last_run
+        self.tags = tags or []
+        self.favorite = favorite
+        self.running = False
+        self.queued = 0  # lançamentos aguardando vaga na fila
+        self.usage = None  # (CPU %, RSS em bytes) enquanto roda
+        self.caminho = caminho
+        self.icon = None
+        self.icon_source = None
+        self.count = 0
+        self.matches = None  # resultados da busca na categoria (None = sem filtro)
+        self.collapsed = False
+
+
+class ProgramListModel(QAbstractListModel):
+    """Modelo plano com cabeçalhos de categoria seguidos dos seus programas"""
+    RowRole = Qt.UserRole + 1
+    KindRole = Qt.UserRole + 2
+    PathRole = Qt.UserRole + 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._index_by_key = {}
+        self._index_dirty = False
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return row.nome
+        if role == Qt.ToolTipRole and row.kind == ProgramRow.PROGRAM:
+            return row.descricao or row.nome
+        if role == self.RowRole:
+            return row
+        if role == self.KindRole:
+            return row.kind
+        if role == self.PathRole:
+            return row.caminho
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        # Só programas entram na seleção múltipla
+        if self._rows[index.row()].kind == ProgramRow.CATEGORY:
+            return Qt.ItemIsEnabled
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def set_categories(self, categorias):
+        """Substitui o conteúdo por uma lista de (categoria, [ProgramRow])"""
+        collapsed = {row.category for row in self._rows
+                     if row.kind == ProgramRow.CATEGORY and row.collapsed}
+        self.beginResetModel()
+        self._rows = []
+        for categoria, programas in categorias:
+            header = ProgramRow(ProgramRow.CATEGORY, categoria, nome=categoria)
+            header.count = len(programas)
+            header.collapsed = categoria in collapsed
+            self._rows.append(header)
+            self._rows.extend(programas)
+        self._rebuild_index()
+        self.endResetModel()
+
+    def _rebuild_index(self):
+        self._index_by_key = {}
+        for i, row in enumerate(self._rows):
+            key = row.key if row.kind == ProgramRow.PROGRAM else (ProgramRow.CATEGORY, row.category)
+            self._index_by_key[key] = i
+        self._index_dirty = False
+
+    def _row_index(self, key):
+        if self._index_dirty:
+            self._rebuild_index()
+        return self._index_by_key.get(key)
+
+    def row_at(self, row):
+        return self._rows[row]
+
+    def rows(self):
+        return self._rows
+
+    def category_rows(self, header_row):
+        """Índices dos programas pertencentes ao cabeçalho informado"""
+        row = header_row + 1
+        while row < len(self._rows) and self._rows[row].kind == ProgramRow.PROGRAM:
+            yield row
+            row += 1
+
+    def index_for_key(self, key):
+        row = self._row_index(key)
+        return self.index(row) if row is not None else QModelIndex()
+
+    def header_index(self, categoria):
+        return self.index_for_key((ProgramRow.CATEGORY, categoria))
+
+    def update_program(self, program):
+        """Troca os dados de uma linha existente sem mexer na estrutura"""
+        index = self.index_for_key(program.key)
+        if not index.isValid():
+            return index
+        old = self._rows[index.row()]
+        program.running = old.running
+        program.queued = old.queued
+        program.usage = old.usage
+        if program.icon is None and program.icon_source == old.icon_source:
+            program.icon = old.icon
+        self._rows[index.row()] = program
+        self.dataChanged.emit(index, index)
+        return index
+
+    def remove_program(self, key):
+        row = self._row_index(key)
+        if row is None:
+            return
+        categoria = self._rows[row].category
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        self._index_dirty = True
+        self.endRemoveRows()
+
+        header_row = self._row_index((ProgramRow.CATEGORY, categoria))
+        header = self._rows[header_row]
+        header.count -= 1
+        if header.count <= 0:
+            # Categoria sem programas deixa de aparecer
+            self.beginRemoveRows(QModelIndex(), header_row, header_row)
+            del self._rows[header_row]
+            self._index_dirty = True
+            self.endRemoveRows()
+        else:
+            index = self.index(header_row)
+            self.dataChanged.emit(index, index)
+
+    def insert_program(self, program):
+        """Insere o programa na posição ordenada da sua categoria"""
+        header_row = self._row_index((ProgramRow.CATEGORY, program.category))
+        if header_row is None:
+            # Nova categoria: posiciona o cabeçalho em ordem alfabética
+            header_row = len(self._rows)
+            for i, row in enumerate(self._rows):
+                if row.kind == ProgramRow.CATEGORY and row.category > program.category:
+                    header_row = i
+                    break
+            header = ProgramRow(ProgramRow.CATEGORY, program.category, nome=program.category)
+            self.beginInsertRows(QModelIndex(), header_row, header_row)
+            self._rows.insert(header_row, header)
+            self._index_dirty = True
+            self.endInsertRows()
+        header = self._rows[header_row]
+
+        position = header_row + 1
+        sort_name = os.path.basename(program.caminho)
+        while (position < len(self._rows)
+               and self._rows[position].kind == ProgramRow.PROGRAM
+               and os.path.basename(self._rows[position].caminho) < sort_name):
+            position += 1
+
+        self.beginInsertRows(QModelIndex(), position, position)
+        self._rows.insert(position, program)
+        self._index_dirty = True
+        self.endInsertRows()
+
+        header.count += 1
+        index = self.index(header_row)
+        self.dataChanged.emit(index, index)
+        return self.index(position)
+
+    def apply_ranking(self, ranks=None):
+        """Reordena as linhas pela relevância da busca (None = ordem alfabética).
+
+        Categorias sobem conforme o melhor programa delas; dentro da
+        categoria, os programas seguem a pontuação e depois o nome do arquivo.
+        """
+        grupos = []
+        for row in self._rows:
+            if row.kind == ProgramRow.CATEGORY:
+                grupos.append((row, []))
+            else:
+                grupos[-1][1].append(row)
+
+        def chave_programa(row):
+            score = ranks.get(row.key, 0) if ranks else 0
+            return (-score, os.path.basename(row.caminho))
+
+        for _, programas in grupos:
+            programas.sort(key=chave_programa)
+        if ranks:
+            grupos.sort(key=lambda g: (-max((ranks.get(p.key, 0) for p in g[1]), default=0), g[0].category))
         else:
-            bg = "#ffffff"
-            bg_hover = "#f8fafc"
-            border_color = "#e8e8e8"
-            text_color = "#2d3436"
-            secondary = "#888"
-
-        accent = "#e74c3c" if self.is_favorite else "#0078d4"
-        running_color = "#27ae60" if self.is_running else "transparent"
-
-        self.setStyleSheet(f"""
-            ListItem {{
-                background-color: {bg};
-                border: 1px solid {border_color};
-                border-radius: 6px;
-            }}
-            ListItem:hover {{
-                background-color: {bg_hover};
-                border-left: 3px solid {accent};
-            }}
-        """)
-        self.running_indicator.setStyleSheet(f"background: {running_color}; border-radius: 4px;")
-        self.name_label.setStyleSheet(f"font-weight: 500; font-size: 12px; color: {text_color};")
-        self.desc_label.setStyleSheet(f"font-size: 11px; color: {secondary};")
-        self.type_label.setStyleSheet(f"font-size: 9px; color: {secondary}; background: {border_color}; border-radius: 3px; padding: 2px 4px;")
-        self.last_run_label.setStyleSheet(f"font-size: 10px; color: {secondary};")
-        self.fav_label.setStyleSheet(f"color: {accent}; font-weight: bold;")
+            grupos.sort(key=lambda g: g[0].category)
 
-    def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton:
-            self.clicked.emit()
-        elif event.button() == Qt.RightButton:
-            self.rightClicked.emit()
-        super().mousePressEvent(event)
+        novas = []
+        for header, programas in grupos:
+            novas.append(header)
+            novas.extend(programas)
+        if all(a is b for a, b in zip(novas, self._rows)):
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        antigas = self._rows
+        self._rows = novas
+        self._index_dirty = True
+        posicao = {id(row): i for i, row in enumerate(novas)}
+        persistentes = self.persistentIndexList()
+        self.changePersistentIndexList(
+            persistentes, [self.index(posicao[id(antigas[index.row()])]) for index in persistentes]
+        )
+        self.layoutChanged.emit()
+
+    def set_icon(self, key, icon):
+        index = self.index_for_key(key)
+        if index.isValid():
+            self._rows[index.row()].icon = icon
+            self.dataChanged.emit(index, index)
+
+    def set_running(self, key, running):
+        index = self.index_for_key(key)
+        if index.isValid():
+            self._rows[index.row()].running = running
+            if not running:
+                self._rows[index.row()].usage = None
+            self.dataChanged.emit(index, index)
+
+    def set_usage(self, key, usage):
+        index = self.index_for_key(key)
+        if index.isValid():
+            self._rows[index.row()].usage = usage
+            self.dataChanged.emit(index, index)
+
+    def set_queued(self, key, queued):
+        index = self.index_for_key(key)
+        if index.isValid():
+            self._rows[index.row()].queued = queued
+            self.dataChanged.emit(index, index)
+
+
+class ProgramDelegate(QStyledItemDelegate):
+    """Desenha cabeçalhos e programas sem criar widgets por linha"""
+
+    # Cores das tags
+    TAG_COLORS = {
+        "trabalho": "#3498db",
+        "pessoal": "#9b59b6",
+        "urgente": "#e74c3c",
+        "teste": "#f39c12",
+        "producao": "#27ae60"
+    }
 
+    ITEM_HEIGHT = 44
+    HEADER_HEIGHT = 32
+    ITEM_SPACING = 4
+    CATEGORY_SPACING = 8
+    ITEM_INDENT = 20
 
-class CollapsibleCategory(QWidget):
-    """Categoria colapsavel"""
-    def __init__(self, title, parent=None):
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.is_collapsed = False
-        self.is_dark_theme = False
-        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-
-        main_layout = QVBoxLayout(self)
-        main_layout.setContentsMargins(0, 0, 0, 4)
-        main_layout.setSpacing(0)
-
-        # Header clicavel
-        self.header = QFrame()
-        self.header.setCursor(Qt.PointingHandCursor)
-        self.header.setFixedHeight(32)
-        header_layout = QHBoxLayout(self.header)
-        header_layout.setContentsMargins(8, 0, 8, 0)
-
-        self.arrow_label = QLabel(">")
-        self.arrow_label.setFixedWidth(16)
-        header_layout.addWidget(self.arrow_label)
-
-        self.title_label = QLabel(title)
-        self.title_label.setStyleSheet("font-weight: 600; font-size: 12px;")
-        header_layout.addWidget(self.title_label, 1)
-
-        self.count_label = QLabel("0")
-        self.count_label.setStyleSheet("color: #888; font-size: 11px;")
-        header_layout.addWidget(self.count_label)
-
-        main_layout.addWidget(self.header)
-
-        # Container para itens
-        self.content = QWidget()
-        self.content_layout = QVBoxLayout(self.content)
-        self.content_layout.setContentsMargins(20, 4, 0, 4)
-        self.content_layout.setSpacing(4)
-        main_layout.addWidget(self.content)
-
-        self.header.mousePressEvent = self.toggle_collapse
-        self.update_style()
-
-    def toggle_collapse(self, event=None):
-        self.is_collapsed = not self.is_collapsed
-        self.content.setVisible(not self.is_collapsed)
-        self.arrow_label.setText(">" if self.is_collapsed else "v")
-
-    def add_item(self, item):
-        self.content_layout.addWidget(item)
-        count = self.content_layout.count()
-        self.count_label.setText(str(count))
+        self.name_font = QFont("Segoe UI")
+        self.name_font.setPixelSize(12)
+        self.name_font.setWeight(QFont.Medium)
+        self.header_font = QFont("Segoe UI")
+        self.header_font.setPixelSize(12)
+        self.header_font.setWeight(QFont.DemiBold)
+        self.desc_font = QFont("Segoe UI")
+        self.desc_font.setPixelSize(11)
+        self.small_font = QFont("Segoe UI")
+        self.small_font.setPixelSize(10)
+        self.tag_font = QFont("Segoe UI")
+        self.tag_font.setPixelSize(9)
+        self.set_theme(False)
 
     def set_theme(self, is_dark):
         self.is_dark_theme = is_dark
-        self.update_style()
+        if is_dark:
+            self.colors = {
+                'bg': QColor("#16213e"),
+                'bg_hover': QColor("#1a2744"),
+                'border': QColor("#0f3460"),
+                'text': QColor("#eaeaea"),
+                'secondary': QColor("#888"),
+                'header_bg': QColor("#1a2744"),
+            }
+        else:
+            self.colors = {
+                'bg': QColor("#ffffff"),
+                'bg_hover': QColor("#f8fafc"),
+                'border': QColor("#e8e8e8"),
+                'text': QColor("#2d3436"),
+                'secondary': QColor("#888"),
+                'header_bg': QColor("#f0f4f8"),
+            }
+
+    def sizeHint(self, option, index):
+        row = index.data(ProgramListModel.RowRole)
+        if row.kind == ProgramRow.CATEGORY:
+            # Espaço entre categorias fica acima do cabeçalho
+            spacing = self.CATEGORY_SPACING if index.row() else 0
+            return QSize(option.rect.width(), self.HEADER_HEIGHT + self.ITEM_SPACING + spacing)
+        return QSize(option.rect.width(), self.ITEM_HEIGHT + self.ITEM_SPACING)
+
+    def paint(self, painter, option, index):
+        row = index.data(ProgramListModel.RowRole)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        if row.kind == ProgramRow.CATEGORY:
+            self._paint_header(painter, option, index, row)
+        else:
+            self._paint_program(painter, option, row)
+        painter.restore()
+
+    def _paint_header(self, painter, option, index, row):
+        rect = QRect(option.rect)
+        if index.row():
+            rect.setTop(rect.top() + self.CATEGORY_SPACING)
+        rect.setHeight(self.HEADER_HEIGHT)
+
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.colors['header_bg'])
+        painter.drawRoundedRect(rect, 4, 4)
+
+        inner = rect.adjusted(8, 0, -8, 0)
+        painter.setFont(self.header_font)
+        painter.setPen(QColor("#0078d4"))
+        painter.drawText(QRect(inner.left(), inner.top(), 16, inner.height()),
+                         Qt.AlignVCenter | Qt.AlignLeft, ">" if row.collapsed else "v")
+
+        painter.setFont(self.desc_font)
+        painter.setPen(self.colors['secondary'])
+        painter.drawText(inner, Qt.AlignVCenter | Qt.AlignRight,
+                         str(row.count if row.matches is None else row.matches))
+
+        painter.setFont(self.header_font)
+        painter.setPen(self.colors['text'])
+        title_rect = inner.adjusted(20, 0, -40, 0)
+        painter.drawText(title_rect, Qt.AlignVCenter | Qt.AlignLeft,
+                         painter.fontMetrics().elidedText(row.nome, Qt.ElideRight, title_rect.width()))
+
+    @staticmethod
+    def formatar_memoria(rss):
+        mb = rss / (1024 * 1024)
+        return f"{mb / 1024:.1f}G" if mb >= 1024 else f"{mb:.0f}M"
+
+    def _paint_program(self, painter, option, row):
+        rect = QRect(option.rect)
+        rect.setLeft(rect.left() + self.ITEM_INDENT)
+        rect.setHeight(self.ITEM_HEIGHT)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        selected = bool(option.state & QStyle.State_Selected)
+        accent = QColor("#e74c3c") if row.favorite else QColor("#0078d4")
+
+        # Fundo e borda (selecionado ganha a borda na cor de destaque)
+        painter.setPen(QPen(QColor("#0078d4"), 2) if selected else QPen(self.colors['border'], 1))
+        painter.setBrush(self.colors['bg_hover'] if hovered or selected else self.colors['bg'])
+        painter.drawRoundedRect(QRectF(rect).adjusted(0.5, 0.5, -0.5, -0.5), 6, 6)
+        if hovered:
+            painter.fillRect(QRect(rect.left(), rect.top() + 1, 3, rect.height() - 2), accent)
+
+        x = rect.left() + 10
+        center_y = rect.center().y()
+
+        # Indicador de execucao (vazado enquanto aguarda na fila)
+        if row.running:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor("#27ae60"))
+            painter.drawEllipse(QRect(x, center_y - 4, 8, 8))
+        elif row.queued:
+            painter.setPen(QPen(QColor("#f39c12"), 2))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawEllipse(QRect(x, center_y - 4, 8, 8))
+        x += 16
+
+        # Icone (placeholder com a inicial enquanto o ícone não chega)
+        icon_rect = QRect(x, center_y - 14, 28, 28)
+        if row.icon is not None and not row.icon.isNull():
+            row.icon.paint(painter, icon_rect)
+        else:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self.colors['border'])
+            painter.drawRoundedRect(icon_rect, 6, 6)
+            painter.setFont(self.name_font)
+            painter.setPen(self.colors['secondary'])
+            painter.drawText(icon_rect, Qt.AlignCenter, row.nome[:1].upper())
+        x += 36
+
+        right = rect.right() - 10
 
-    def update_style(self):
-        if self.is_dark_theme:
-            bg = "#1a2744"
-            text = "#eaeaea"
+        # Indicador de favorito
+        if row.favorite:
+            painter.setFont(self.name_font)
+            painter.setPen(accent)
+            painter.drawText(QRect(right - 16, rect.top(), 16, rect.height()),
+                             Qt.AlignVCenter | Qt.AlignLeft, "*")
+        right -= 24
+
+        # Ultima execucao (ou CPU/memoria enquanto roda)
+        painter.setFont(self.small_font)
+        if row.running and row.usage is not None:
+            cpu, rss = row.usage
+            painter.setPen(QColor("#27ae60"))
+            painter.drawText(QRect(right - 70, rect.top(), 70, rect.height()),
+                             Qt.AlignVCenter | Qt.AlignRight, f"{cpu:.0f}% {self.formatar_memoria(rss)}")
         else:
-            bg = "#f0f4f8"
-            text = "#2d3436"
-
-        self.header.setStyleSheet(f"""
-            QFrame {{
-                background-color: {bg};
-                border-radius: 4px;
-            }}
-        """)
-        self.title_label.setStyleSheet(f"font-weight: 600; font-size: 12px; color: {text};")
-        self.arrow_label.setStyleSheet(f"color: #0078d4; font-weight: bold;")
+            painter.setPen(self.colors['secondary'])
+            painter.drawText(QRect(right - 70, rect.top(), 70, rect.height()),
+                             Qt.AlignVCenter | Qt.AlignRight, row.last_run)
+        right -= 78
+
+        # Tipo (extensao)
+        if row.tipo:
+            type_rect = QRect(right - 40, center_y - 9, 40, 18)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self.colors['border'])
+            painter.drawRoundedRect(type_rect, 3, 3)
+            painter.setFont(self.tag_font)
+            painter.setPen(self.colors['secondary'])
+            painter.drawText(type_rect, Qt.AlignCenter, row.tipo)
+        right -= 48
+
+        # Nome
+        painter.setFont(self.name_font)
+        name_metrics = painter.fontMetrics()
+        name_width = max(120, min(name_metrics.horizontalAdvance(row.nome), (right - x) // 2))
+        painter.setPen(self.colors['text'])
+        painter.drawText(QRect(x, rect.top(), name_width, rect.height()), Qt.AlignVCenter | Qt.AlignLeft,
+                         name_metrics.elidedText(row.nome, Qt.ElideRight, name_width))
+        x += name_width + 8
+
+        # Tags (max 2 visiveis)
+        painter.setFont(self.tag_font)
+        tag_metrics = painter.fontMetrics()
+        for tag in row.tags[:2]:
+            tag_width = tag_metrics.horizontalAdvance(tag) + 8
+            if x + tag_width > right:
+                break
+            tag_rect = QRect(x, center_y - 8, tag_width, 16)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(self.TAG_COLORS.get(tag.lower(), "#888")))
+            painter.drawRoundedRect(tag_rect, 3, 3)
+            painter.setPen(QColor("white"))
+            painter.drawText(tag_rect, Qt.AlignCenter, tag)
+            x += tag_width + 4
+
+        # Descricao
+        if row.descricao and right - x > 20:
+            painter.setFont(self.desc_font)
+            painter.setPen(self.colors['secondary'])
+            desc_rect = QRect(x + 4, rect.top(), right - x - 4, rect.height())
+            painter.drawText(desc_rect, Qt.AlignVCenter | Qt.AlignLeft,
+                             painter.fontMetrics().elidedText(row.descricao, Qt.ElideRight, desc_rect.width()))
+
+
+class ProgramListView(QListView):
+    """Lista virtualizada: só as linhas visíveis são desenhadas"""
+    programClicked = Signal(str)
+    programRightClicked = Signal(str)
+    categoryClicked = Signal(int)
+    categoryRightClicked = Signal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMouseTracking(True)
+        # Ctrl/Shift + clique seleciona; clique simples continua abrindo o programa
+        self.setSelectionMode(QListView.ExtendedSelection)
+        self.loading = False
+        self.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setCursor(Qt.PointingHandCursor)
+
+    def set_loading(self, loading):
+        """Mostra linhas de esqueleto enquanto a lista ainda está vazia"""
+        self.loading = loading
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.loading or self.model() is None or self.model().rowCount():
+            return
+        delegate = self.itemDelegate()
+        painter = QPainter(self.viewport())
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        width = self.viewport().width()
+        y = 0
+        while y < self.viewport().height():
+            # Cabeçalho + alguns itens, nas mesmas medidas do delegate
+            painter.setBrush(delegate.colors['header_bg'])
+            painter.drawRoundedRect(QRect(0, y, width, delegate.HEADER_HEIGHT), 4, 4)
+            y += delegate.HEADER_HEIGHT + delegate.ITEM_SPACING
+            for i in range(4):
+                rect = QRect(delegate.ITEM_INDENT, y, width - delegate.ITEM_INDENT, delegate.ITEM_HEIGHT)
+                painter.setBrush(delegate.colors['bg'])
+                painter.drawRoundedRect(rect, 6, 6)
+                painter.setBrush(delegate.colors['border'])
+                painter.drawRoundedRect(QRect(rect.left() + 26, rect.center().y() - 14, 28, 28), 4, 4)
+                painter.drawRoundedRect(QRect(rect.left() + 62, rect.center().y() - 5, 120 + 30 * (i % 3), 10), 3, 3)
+                y += delegate.ITEM_HEIGHT + delegate.ITEM_SPACING
+            y += delegate.CATEGORY_SPACING
+        painter.end()
+
+    def selected_paths(self):
+        """Caminhos dos programas selecionados que continuam visíveis"""
+        return [index.data(ProgramListModel.PathRole)
+                for index in sorted(self.selectionModel().selectedIndexes(), key=lambda i: i.row())
+                if not self.isRowHidden(index.row())]
+
+    def mousePressEvent(self, event):
+        index = self.indexAt(event.position().toPoint())
+        selecionando = event.modifiers() & (Qt.ControlModifier | Qt.ShiftModifier)
+        if index.isValid():
+            row = index.data(ProgramListModel.RowRole)
+            if row.kind == ProgramRow.CATEGORY:
+                if event.button() == Qt.LeftButton:
+                    self.categoryClicked.emit(index.row())
+                elif event.button() == Qt.RightButton:
+                    self.categoryRightClicked.emit(index.row())
+                    return
+            elif event.button() == Qt.LeftButton and not selecionando:
+                self.clearSelection()
+                self.programClicked.emit(row.caminho)
+                return
+            elif event.button() == Qt.RightButton:
+                self.programRightClicked.emit(row.caminho)
+                return
+        super().mousePressEvent(event)
+
 
 class HubApp(QWidget):
+    config_error = Signal(str)
+    process_exited = Signal(object)
+    launch_started = Signal(object)
+    launch_failed = Signal(object, str)
+    resources_sampled = Signal(list)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Libby v2.0")
@@ -371,47 +1271,92 @@ class HubApp(QWidget):
 
         # Configurações
         self.hub_dir = None
-        self.botoes = []
         self.program_info = {}  # Informações adicionais dos programas
+        self.hub_snapshot = {}  # key -> (categoria, arquivo, mtime, hash dos metadados)
+        self.search_index = SearchIndex()
+        self.linhas_ocultas = set()  # keys/cabeçalhos escondidos na view
+        self.keys_filtradas = set()  # programas que não passam na busca/filtro
+        self.filtradas_por_categoria = Counter()
+        self.filter_generation = 0
+        self.ranks_busca = None  # resultado da última busca aplicada (key -> pontuação)
+        self.hub_categorias = []
+        self.pastas_pendentes = set()
         self.current_theme = "light"
-        self.icon_cache = {}
+        self.store = None
+        self.icon_cache = {}  # origem -> QIcon já decodificado
+        self.icon_waiting = {}  # origem -> keys aguardando o ícone
+        self.icon_refs = {}  # origem -> PNG já reduzido no cache em disco
 
         # Carrega configuração
         self.carregar_config()
+        self.scanner = HubScanner(self.hub_dir)
 
         self.setup_ui()
         self.apply_theme()
         self.setup_tray_icon()
+        self.setup_watcher()
+        self.setup_search()
+
+        # Processos lançados; o fim deles chega à interface via sinal
+        self.supervisor = ProcessSupervisor(on_exit=self.process_exited.emit)
+        self.process_exited.connect(self._processo_finalizado)
+        self.history = RunHistory()
+        # CPU/memória dos programas em execução (psutil ou /proc, quando houver)
+        self.sampler = ResourceSampler(
+            self.supervisor, interval=self.sample_interval, on_sample=self.resources_sampled.emit
+        )
+        self.resources_sampled.connect(self._recursos_medidos)
+        self.sampler.start()
+        # Os Popen rodam num pool limitado para lotes grandes não travarem a interface
+        self.launch_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="libby-launch")
+        self.launch_started.connect(self._programa_iniciado)
+        self.launch_failed.connect(self._erro_lancamento)
+        self.scheduler = LaunchScheduler(
+            self.supervisor, self.launch_limits, executor=self.launch_pool,
+            on_start=self.launch_started.emit,
+            on_error=lambda job, e: self.launch_failed.emit(job, str(e))
+        )
+        self.lote_total = 0
+        self.lote_concluidos = 0
+        self.log_dialogs = {}  # key -> LogTailDialog aberto
+        self.keys_na_fila = Counter()
+        self.launch_timer = QTimer(self)
+        self.launch_timer.setSingleShot(True)
+        self.launch_timer.timeout.connect(self._drenar_fila)
 
         # Cria diretório de cache se não existir
         os.makedirs(CACHE_DIR, exist_ok=True)
-
-        # Se já tinha uma pasta salva, carrega
+        self.icon_loader = IconLoader(CACHE_DIR, self)
+        self.icon_loader.icon_loaded.connect(self._icone_carregado)
+        self.icon_loader.start()
+
+        # Execuções agendadas: um heap com o próximo disparo e um único timer
+        self.agendamentos = ScheduleQueue()
+        self.schedule_timer = QTimer(self)
+        self.schedule_timer.setSingleShot(True)
+        self.schedule_timer.timeout.connect(self._disparar_agendados)
+        self._carregar_agendamentos()
+
+        # Se já tinha uma pasta salva, carrega em background (a janela aparece antes)
+        self.scan_generation = 0
+        self.scan_worker = None
+        self.startup_metrics = {}
+        self.import_worker = None
+        self.import_dialog = None
+        self.add_workers = set()
+        self.content_store = None
+        # Primeira volta do event loop = janela já exibida; postado antes de a
+        # varredura começar para vir antes do aviso de fim dela
+        QTimer.singleShot(0, self._janela_exibida)
         if self.hub_dir:
-            self.carregar_programas()
+            self.carregar_em_segundo_plano()
         else:
             self.toggle_botoes(False)
 
     def setup_tray_icon(self):
         """Configura o ícone da bandeja do sistema"""
-        img = QImage(os.path.join(ASSETS_DIR, "android-chrome-192x192.png"))
-
         # Recorta margens transparentes para o ícone ocupar mais espaço na bandeja
-        w, h = img.width(), img.height()
-        left, top, right, bottom = w, h, 0, 0
-        for y in range(h):
-            for x in range(w):
-                if (img.pixel(x, y) >> 24) & 0xFF > 0:
-                    left = min(left, x)
-                    top = min(top, y)
-                    right = max(right, x)
-                    bottom = max(bottom, y)
-
-        if right > left and bottom > top:
-            cropped = img.copy(left, top, right - left + 1, bottom - top + 1)
-            tray_pixmap = QPixmap.fromImage(cropped)
-        else:
-            tray_pixmap = QPixmap(os.path.join(ASSETS_DIR, "android-chrome-192x192.png"))
+        tray_pixmap = carregar_asset("android-chrome-192x192.png", recortar=True)
 
         self.tray_icon = QSystemTrayIcon(self)
         self.tray_icon.setIcon(QIcon(tray_pixmap))
@@ -426,6 +1371,16 @@ class HubApp(QWidget):
 
         tray_menu.addSeparator()
 
+        export_action = QAction("Exportar configuração (JSON)...", self)
+        export_action.triggered.connect(self.exportar_config)
+        tray_menu.addAction(export_action)
+
+        limits_action = QAction("Limites de execução...", self)
+        limits_action.triggered.connect(self.configurar_limites)
+        tray_menu.addAction(limits_action)
+
+        tray_menu.addSeparator()
+
         exit_action = QAction("Sair", self)
         exit_action.triggered.connect(self.quit_app)
         tray_menu.addAction(exit_action)
@@ -434,6 +1389,32 @@ class HubApp(QWidget):
         self.tray_icon.activated.connect(self.tray_icon_activated)
         self.tray_icon.show()
 
+    def setup_search(self):
+        """Busca com debounce, executada fora da thread da interface"""
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(120)
+        self.filter_timer.timeout.connect(self.filtrar_programas)
+
+        self.search_worker = SearchWorker(self.search_index, self)
+        self.search_worker.results_ready.connect(self._resultado_busca)
+        self.search_worker.start()
+
+    def setup_watcher(self):
+        """Sincroniza a lista automaticamente quando a pasta Hub muda"""
+        self.hub_watcher = QFileSystemWatcher(self)
+        self.hub_watcher.directoryChanged.connect(self._agendar_sincronizacao)
+
+        # Fallback para pastas que o watcher nativo não aceita (ex: alguns compartilhamentos)
+        self.hub_poller = DirectoryPoller(self)
+        self.hub_poller.directories_changed.connect(self._agendar_sincronizacao)
+
+        # Agrupa rajadas de alterações numa única sincronização
+        self.sync_timer = QTimer(self)
+        self.sync_timer.setSingleShot(True)
+        self.sync_timer.setInterval(300)
+        self.sync_timer.timeout.connect(self._sincronizar_pastas)
+
     def show_from_tray(self):
         """Restaura a janela da bandeja"""
         self.showNormal()
@@ -442,6 +1423,23 @@ class HubApp(QWidget):
     def quit_app(self):
         """Fecha completamente o aplicativo"""
         self.tray_icon.hide()
+        self.hub_poller.stop()
+        if self.scan_worker is not None:
+            self.scan_worker.wait()
+        if self.import_worker is not None:
+            self.import_worker.cancel()
+            self.import_worker.wait()
+        for worker in list(self.add_workers):
+            worker.wait()
+        self._salvar_snapshot()
+        self.icon_loader.stop()
+        self.search_worker.stop()
+        self.supervisor.stop()
+        self.launch_pool.shutdown(wait=False, cancel_futures=True)
+        self.sampler.stop()
+        self.schedule_timer.stop()
+        self.config_writer.close()
+        self.store.close()
         QApplication.quit()
 
     def tray_icon_activated(self, reason):
@@ -473,21 +1471,21 @@ class HubApp(QWidget):
 
         # Logo + Titulo
         header_logo = QLabel()
-        header_logo_pixmap = QPixmap(os.path.join(ASSETS_DIR, "favicon-32x32.png"))
+        header_logo_pixmap = carregar_asset("favicon-32x32.png", 28)
         if not header_logo_pixmap.isNull():
-            header_logo.setPixmap(header_logo_pixmap.scaled(28, 28, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            header_logo.setPixmap(header_logo_pixmap)
         header_logo.setFixedSize(28, 28)
         header_layout.addWidget(header_logo)
 
         title = QLabel("Libby")
-        title.setStyleSheet("font-size: 18px; font-weight: bold; color: #0078d4;")
+        title.setObjectName("titulo")
         header_layout.addWidget(title)
 
         # Busca
         self.search_bar = QLineEdit()
         self.search_bar.setPlaceholderText("Buscar...")
         self.search_bar.setFixedWidth(250)
-        self.search_bar.textChanged.connect(self.filtrar_programas)
+        self.search_bar.textChanged.connect(self._agendar_filtro)
         header_layout.addWidget(self.search_bar)
 
         # Filtro
@@ -550,188 +1548,63 @@ class HubApp(QWidget):
         content_layout = QVBoxLayout(content_area)
         content_layout.setContentsMargins(12, 8, 12, 4)
 
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setFrameShape(QFrame.NoFrame)
-        self.scroll_content = QWidget()
-        self.scroll_layout = QVBoxLayout(self.scroll_content)
-        self.scroll_layout.setSpacing(8)
-        self.scroll_layout.setContentsMargins(0, 0, 0, 0)
-        self.scroll_layout.setAlignment(Qt.AlignTop)
-        self.scroll_area.setWidget(self.scroll_content)
-        content_layout.addWidget(self.scroll_area)
+        self.program_model = ProgramListModel(self)
+        self.program_delegate = ProgramDelegate(self)
+        self.program_view = ProgramListView()
+        self.program_view.setModel(self.program_model)
+        self.program_view.setItemDelegate(self.program_delegate)
+        self.program_view.programClicked.connect(self.abrir_programa)
+        self.program_view.programRightClicked.connect(self.show_context_menu)
+        self.program_view.categoryClicked.connect(self.toggle_categoria)
+        self.program_view.categoryRightClicked.connect(self.show_category_menu)
+        content_layout.addWidget(self.program_view)
 
         self.layout.addWidget(content_area, 1)
 
         # Status bar
+        status_bar = QFrame()
+        status_bar.setFixedHeight(24)
+        status_layout = QHBoxLayout(status_bar)
+        status_layout.setContentsMargins(0, 0, 12, 0)
+
         self.status_label = QLabel("Pronto")
-        self.status_label.setFixedHeight(24)
-        self.status_label.setStyleSheet("padding-left: 16px; color: #666; font-size: 11px;")
-        self.layout.addWidget(self.status_label)
+        self.status_label.setObjectName("status")
+        status_layout.addWidget(self.status_label, 1)
+
+        # Fila de lançamentos (só aparece quando há programas aguardando)
+        self.btn_fila = QPushButton()
+        self.btn_fila.setToolTip("Programas aguardando vaga")
+        self.btn_fila.setObjectName("botaoFila")
+        self.btn_fila.clicked.connect(self.mostrar_fila)
+        self.btn_fila.setVisible(False)
+        status_layout.addWidget(self.btn_fila)
+
+        self.layout.addWidget(status_bar)
 
     def apply_theme(self):
-        """Aplica tema escuro ou claro"""
-        if self.current_theme == "dark":
-            self.setStyleSheet("""
-                QWidget {
-                    background-color: #1a1a2e;
-                    color: #eaeaea;
-                    font-family: 'Segoe UI', Arial;
-                }
-                QFrame {
-                    background-color: #1a1a2e;
-                }
-                QLineEdit {
-                    background-color: #16213e;
-                    border: 1px solid #0f3460;
-                    padding: 8px 12px;
-                    border-radius: 6px;
-                    color: #eaeaea;
-                }
-                QLineEdit:focus {
-                    border: 1px solid #0078d4;
-                }
-                QPushButton {
-                    background-color: #0f3460;
-                    color: white;
-                    border: none;
-                    padding: 8px 14px;
-                    border-radius: 6px;
-                    font-weight: 500;
-                }
-                QPushButton:hover {
-                    background-color: #0078d4;
-                }
-                QPushButton:pressed {
-                    background-color: #005a9e;
-                }
-                QGroupBox {
-                    font-weight: 600;
-                    font-size: 13px;
-                    border: none;
-                    border-radius: 8px;
-                    margin-top: 8px;
-                    padding-top: 16px;
-                    background-color: #16213e;
-                }
-                QGroupBox::title {
-                    subcontrol-origin: margin;
-                    left: 12px;
-                    padding: 0 8px;
-                    color: #0078d4;
-                }
-                QScrollArea {
-                    border: none;
-                    background-color: transparent;
-                }
-                QComboBox {
-                    background-color: #16213e;
-                    border: 1px solid #0f3460;
-                    padding: 6px 10px;
-                    border-radius: 6px;
-                    color: #eaeaea;
-                }
-                QComboBox:hover {
-                    border: 1px solid #0078d4;
-                }
-                QComboBox::drop-down {
-                    border: none;
-                    padding-right: 8px;
-                }
-                QProgressBar {
-                    background-color: #16213e;
-                    border: none;
-                }
-                QProgressBar::chunk {
-                    background-color: #0078d4;
-                }
-            """)
-            self.btn_theme.setToolTip("Tema Claro")
-        else:
-            self.setStyleSheet("""
-                QWidget {
-                    background-color: #f5f7fa;
-                    color: #2d3436;
-                    font-family: 'Segoe UI', Arial;
-                }
-                QFrame {
-                    background-color: #ffffff;
-                }
-                QLineEdit {
-                    background-color: #ffffff;
-                    border: 1px solid #dfe6e9;
-                    padding: 8px 12px;
-                    border-radius: 6px;
-                }
-                QLineEdit:focus {
-                    border: 1px solid #0078d4;
-                }
-                QPushButton {
-                    background-color: #0078d4;
-                    color: white;
-                    border: none;
-                    padding: 8px 14px;
-                    border-radius: 6px;
-                    font-weight: 500;
-                }
-                QPushButton:hover {
-                    background-color: #106ebe;
-                }
-                QPushButton:pressed {
-                    background-color: #005a9e;
-                }
-                QGroupBox {
-                    font-weight: 600;
-                    font-size: 13px;
-                    border: none;
-                    border-radius: 8px;
-                    margin-top: 8px;
-                    padding-top: 16px;
-                    background-color: #ffffff;
-                }
-                QGroupBox::title {
-                    subcontrol-origin: margin;
-                    left: 12px;
-                    padding: 0 8px;
-                    color: #0078d4;
-                }
-                QScrollArea {
-                    border: none;
-                    background-color: transparent;
-                }
-                QComboBox {
-                    background-color: #ffffff;
-                    border: 1px solid #dfe6e9;
-                    padding: 6px 10px;
-                    border-radius: 6px;
-                }
-                QComboBox:hover {
-                    border: 1px solid #0078d4;
-                }
-                QComboBox::drop-down {
-                    border: none;
-                    padding-right: 8px;
-                }
-                QProgressBar {
-                    background-color: #dfe6e9;
-                    border: none;
-                }
-                QProgressBar::chunk {
-                    background-color: #0078d4;
-                }
-            """)
-            self.btn_theme.setToolTip("Tema Escuro")
+        """Aplica tema escuro ou claro trocando só a propriedade 'tema' da janela.
+
+        A folha de estilo é uma só, instalada na aplicação e lida uma vez; a
+        troca de tema apenas repole os widgets para reavaliar os seletores.
+        """
+        app = QApplication.instance()
+        if app.styleSheet() != TEMA_QSS:
+            app.setStyleSheet(TEMA_QSS)
+        dark = self.current_theme == "dark"
+        self.program_delegate.set_theme(dark)
+        self.setProperty("tema", self.current_theme)
+        estilo = self.style()
+        for widget in (self, *self.findChildren(QWidget)):
+            estilo.unpolish(widget)
+            estilo.polish(widget)
+        self.btn_theme.setToolTip("Tema Claro" if dark else "Tema Escuro")
 
     def toggle_theme(self):
         """Alterna entre tema claro e escuro"""
         self.current_theme = "dark" if self.current_theme == "light" else "light"
         self.apply_theme()
-        # Atualiza tema dos itens e categorias
-        is_dark = self.current_theme == "dark"
-        for _, item, _ in self.botoes:
-            item.set_theme(is_dark)
-        for cat in getattr(self, 'categories', []):
-            cat.set_theme(is_dark)
+        # Apenas as linhas visíveis da lista são redesenhadas
+        self.program_view.viewport().update()
         self.salvar_config()
 
     def toggle_botoes(self, ativo: bool):
@@ -751,6 +1624,33 @@ class HubApp(QWidget):
         descricao = program_data.get('description', "Sem descrição")
         contador = program_data.get('launch_count', 0)
         ultima = program_data.get('last_opened', "Nunca")
+        rodando = self.supervisor.running_count(key)
+
+        execucao = ""
+        stats = self.history.stats(key)
+        if stats:
+            ultima_exec = stats['last']
+            execucao = (
+                f"\n\nHistórico ({stats['runs']} execuções registradas):\n"
+                f"Duração p50: {self._formatar_duracao(stats['p50'])}  "
+                f"p95: {self._formatar_duracao(stats['p95'])}  "
+                f"máx: {self._formatar_duracao(stats['max_duration'])}\n"
+                f"Últimas 10 (p50): {self._formatar_duracao(stats['p50_recent'])}\n"
+                f"Falhas: {stats['failures']} ({stats['failure_rate']:.0%})\n"
+                f"Última: código {ultima_exec.exit_code} em {self._formatar_duracao(ultima_exec.duration)}"
+            )
+            if stats['peak_rss'] is not None:
+                execucao += f"\nPico de memória: {stats['peak_rss'] / (1024 * 1024):.0f} MB"
+        proximo = self.agendamentos.next_due(key)
+        if proximo is not None:
+            execucao += (f"\nAgendamento: {program_data.get('schedule')} "
+                         f"(próxima: {proximo.strftime('%d/%m/%Y %H:%M')})")
+        if rodando:
+            execucao += f"\nEm execução: {rodando} instância(s)"
+            index = self.program_model.index_for_key(key)
+            usage = self.program_model.row_at(index.row()).usage if index.isValid() else None
+            if usage is not None:
+                execucao += f" - CPU {usage[0]:.0f}%, memória {ProgramDelegate.formatar_memoria(usage[1])}"
 
         QMessageBox.information(
             self, "Informações",
@@ -758,38 +1658,83 @@ class HubApp(QWidget):
             f"Descrição: {descricao}\n\n"
             f"Executado: {contador} vez(es)\n"
             f"Última vez: {ultima}"
+            f"{execucao}"
         )
 
-    def salvar_config(self):
-        """Salva configurações no config.json"""
-        try:
-            os.makedirs(APPDATA_DIR, exist_ok=True)
-            config = {
-                "hub_dir": self.hub_dir,
-                "theme": self.current_theme,
-                "program_info": self.program_info
-            }
-            with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-                json.dump(config, f, indent=4, ensure_ascii=False)
-        except Exception as e:
-            QMessageBox.warning(self, "Aviso", f"Não foi possível salvar config:\n{e}")
+    @staticmethod
+    def _formatar_duracao(segundos):
+        if segundos is None:
+            return "-"
+        if segundos < 60:
+            return f"{segundos:.1f}s"
+        minutos, segundos = divmod(int(segundos), 60)
+        if minutos < 60:
+            return f"{minutos}m{segundos:02d}s"
+        horas, minutos = divmod(minutos, 60)
+        return f"{horas}h{minutos:02d}m"
+
+    def salvar_config(self, keys=(), removidas=()):
+        """Marca configurações e programas alterados; a gravação ocorre em background"""
+        self.config_writer.set_settings(hub_dir=self.hub_dir, theme=self.current_theme,
+                                        launch_limits=self.launch_limits)
+        for key in keys:
+            if key in self.program_info:
+                self.config_writer.put(key, self.program_info[key])
+        for key in removidas:
+            self.config_writer.delete(key)
+
+    def _erro_salvar_config(self, mensagem):
+        QMessageBox.warning(self, "Aviso", f"Não foi possível salvar config:\n{mensagem}")
 
     def carregar_config(self):
-        """Carrega configurações do config.json"""
-        if os.path.exists(CONFIG_FILE):
+        """Carrega configurações do store (migra o config.json na primeira vez)"""
+        settings = {}
+        try:
+            self.store = open_store()
+            settings, self.program_info = self.store.load()
+        except Exception:
+            # Banco corrompido ou bloqueado: usa o config.json, que o SQLite regrava ao
+            # fechar; o que esta sessão gravar nele volta ao banco na próxima abertura
+            if self.store is not None:
+                self.store.close()
+            self.store = open_store("json")
             try:
-                with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    self.hub_dir = data.get("hub_dir", None)
-                    self.current_theme = data.get("theme", "light")
-                    self.program_info = data.get("program_info", {})
-            except Exception:
-                pass
+                settings, self.program_info = self.store.load()
+            except (OSError, ValueError):
+                settings, self.program_info = {}, {}
+        self.hub_dir = settings.get("hub_dir", None)
+        self.current_theme = settings.get("theme", "light")
+        self.launch_limits = dict(DEFAULT_LIMITS, **settings.get("launch_limits", {}))
+        self.sample_interval = float(settings.get("sample_interval", 2.0))
+        self.import_options = {
+            'depth': int(settings.get("import_depth", IMPORT_DEPTH)),
+            'ignore': list(settings.get("import_ignore", IGNORE_GLOBS)),
+        }
+        # Erros da thread de gravação chegam à interface via sinal
+        self.config_writer = DebouncedWriter(self.store, on_error=lambda e: self.config_error.emit(str(e)),
+                                             known=self.program_info)
+        self.config_error.connect(self._erro_salvar_config)
+
+    def exportar_config(self):
+        """Exporta os metadados no formato do config.json"""
+        arquivo, _ = QFileDialog.getSaveFileName(
+            self, "Exportar configuração", "libby-config.json", "JSON (*.json)"
+        )
+        if arquivo:
+            try:
+                self.config_writer.flush()
+                self.store.export_json(arquivo)
+                self.status_label.setText(f"Configuração exportada: {os.path.basename(arquivo)}")
+            except Exception as e:
+                QMessageBox.critical(self, "Erro", f"Não foi possível exportar:\n{e}")
 
     def escolher_pasta(self):
         pasta = QFileDialog.getExistingDirectory(self, "Escolher pasta Hub")
         if pasta:
             self.hub_dir = pasta
+            self.scanner = HubScanner(pasta)
+            self.hub_snapshot = {}
+            self.hub_poller.set_paths(set())
             self.salvar_config()
             self.toggle_botoes(True)
             self.carregar_programas()
@@ -814,86 +1759,70 @@ class HubApp(QWidget):
         if not ok or not categoria:
             return
 
-        # Cria categoria
-        categoria_path = os.path.join(self.hub_dir, categoria)
-        os.makedirs(categoria_path, exist_ok=True)
-
-        # Procura programas na pasta
-        importados = 0
-        for item in os.listdir(pasta):
-            item_path = os.path.join(pasta, item)
-
-            # Se for subpasta com .py ou .bat, cria um .bat apontando para ela
-            if os.path.isdir(item_path):
-                # Procura arquivo principal
-                main_file = None
-                for ext in ['.py', '.bat', '.cmd', '.exe']:
-                    candidates = [f for f in os.listdir(item_path) if f.lower().endswith(ext)]
-                    if candidates:
-                        # Prioriza arquivos com nome parecido com a pasta
-                        for c in candidates:
-                            if item.lower().replace('-', '_').replace(' ', '_') in c.lower().replace('-', '_'):
-                                main_file = c
-                                break
-                        if not main_file:
-                            main_file = candidates[0]
-                        break
-
-                if main_file:
-                    # Cria .bat que aponta para o programa
-                    bat_name = f"{item}.bat"
-                    bat_path = os.path.join(categoria_path, bat_name)
-                    main_path = os.path.join(item_path, main_file)
-
-                    if main_file.endswith('.py'):
-                        content = f'@echo off\ncd /d "{item_path}"\nstart "" pythonw {main_file}'
-                    else:
-                        content = f'@echo off\ncd /d "{item_path}"\nstart "" "{main_file}"'
-
-                    with open(bat_path, 'w') as f:
-                        f.write(content)
-
-                    # Detecta logo na pasta
-                    logo_path = self._find_logo_in_folder(item_path)
-                    if logo_path:
-                        key = bat_path.replace(self.hub_dir, "").strip(os.sep)
-                        self.program_info[key] = self.program_info.get(key, {})
-                        self.program_info[key]['icon'] = logo_path
-
-                    importados += 1
-
-            # Se for arquivo executavel direto
-            elif item.lower().endswith(('.bat', '.cmd', '.py', '.exe', '.lnk')):
-                destino = os.path.join(categoria_path, item)
-                if not os.path.exists(destino):
-                    copy2(item_path, destino)
-                    importados += 1
+        if self.import_worker is not None:
+            QMessageBox.information(self, "Importar", "Já existe uma importação em andamento.")
+            return
 
-        self.salvar_config()
-        self.carregar_programas()
-        self.status_label.setText(f"Importados {importados} programas de '{nome_sugerido}'")
+        self.import_dialog = QProgressDialog(f"Importando '{nome_sugerido}'...", "Cancelar", 0, 0, self)
+        self.import_dialog.setWindowTitle("Importar")
+        self.import_dialog.setWindowModality(Qt.WindowModal)
+        self.import_dialog.setMinimumDuration(300)
+
+        self.import_worker = ImportWorker(pasta, self.hub_dir, categoria, self._store_conteudo(),
+                                          self.import_options, self)
+        self.import_worker.progress.connect(self._progresso_importacao)
+        self.import_worker.imported.connect(
+            lambda importados, metadados, falhas, duplicados: self._importacao_concluida(
+                categoria, nome_sugerido, importados, metadados, falhas, duplicados)
+        )
+        self.import_worker.failed.connect(self._importacao_falhou)
+        self.import_worker.finished.connect(self.import_worker.deleteLater)
+        self.import_dialog.canceled.connect(self.import_worker.cancel)
+        self.import_worker.start()
+
+    def _progresso_importacao(self, feitos, total):
+        if self.import_dialog is not None and not self.import_dialog.wasCanceled():
+            self.import_dialog.setMaximum(max(total, 1))
+            self.import_dialog.setValue(feitos)
+
+    def _fechar_importacao(self):
+        """Libera o worker e o diálogo; devolve se o usuário cancelou"""
+        self.import_worker = None
+        cancelada = self.import_dialog.wasCanceled()
+        self.import_dialog.close()
+        self.import_dialog.deleteLater()
+        self.import_dialog = None
+        return cancelada
+
+    def _importacao_concluida(self, categoria, origem, importados, metadados, falhas, duplicados):
+        """Grava os metadados de uma vez e sincroniza só a categoria importada"""
+        cancelada = self._fechar_importacao()
+        for key, dados in metadados.items():
+            self.program_info.setdefault(key, {}).update(dados)
+        self.salvar_config(metadados)
+        self._agendar_sincronizacao([self.hub_dir, os.path.join(self.hub_dir, categoria)])
+
+        texto = f"Importados {importados} programas de '{origem}'"
+        if duplicados:
+            texto += f", {len(duplicados)} com conteúdo já existente no Hub"
+        if cancelada:
+            texto += " (cancelado)"
+        self.status_label.setText(texto)
+        if duplicados:
+            self._avisar_duplicados(duplicados)
+        if falhas:
+            linhas = "\n".join(f"{item}: {erro}" for item, erro in falhas[:10])
+            if len(falhas) > 10:
+                linhas += f"\n... e mais {len(falhas) - 10}"
+            QMessageBox.warning(self, "Importar", f"Alguns itens não foram importados:\n{linhas}")
+
+    def _importacao_falhou(self, mensagem):
+        self._fechar_importacao()
+        QMessageBox.warning(self, "Aviso", f"Erro ao importar:\n{mensagem}")
 
     def _find_logo_in_folder(self, folder):
-        """Procura arquivo de logo em uma pasta"""
-        logo_names = ['logo', 'icon', 'icone', 'favicon', 'app']
-        logo_exts = ['.png', '.ico', '.jpg', '.jpeg', '.bmp']
-
-        for name in logo_names:
-            for ext in logo_exts:
-                path = os.path.join(folder, name + ext)
-                if os.path.exists(path):
-                    return path
-                # Tenta com maiusculas
-                path = os.path.join(folder, name.capitalize() + ext)
-                if os.path.exists(path):
-                    return path
-
-        # Procura qualquer .ico na pasta
-        for f in os.listdir(folder):
-            if f.lower().endswith('.ico'):
-                return os.path.join(folder, f)
-
-        return None
+        """Procura arquivo de logo em uma pasta (memorizado pelo HubScanner)"""
+        return self.scanner.find_logo(folder)
 
     def nova_categoria(self):
         if not self.hub_dir:
@@ -912,8 +1841,7 @@ class HubApp(QWidget):
             self, "Escolher programa", "", "Programas (*.exe *.lnk *.bat *.cmd *.py);;Todos os arquivos (*.*)"
         )
         if arquivo:
-            categorias = [d for d in os.listdir(self.hub_dir)
-                          if os.path.isdir(os.path.join(self.hub_dir, d))]
+            categorias = [nome for nome, _ in self.scanner.list_categories()]
             if not categorias:
                 QMessageBox.warning(self, "Aviso", "Nenhuma categoria criada ainda!")
                 return
@@ -923,42 +1851,309 @@ class HubApp(QWidget):
             )
             if ok and categoria:
                 destino = os.path.join(self.hub_dir, categoria, os.path.basename(arquivo))
-                try:
-                    copy2(arquivo, destino)
-                    self.carregar_programas()
-                    self.status_label.setText(f"Programa adicionado: {os.path.basename(arquivo)}")
-                except Exception as e:
-                    QMessageBox.critical(self, "Erro", f"Não foi possível adicionar:\n{e}")
+                self.status_label.setText(f"Adicionando {os.path.basename(arquivo)}...")
+                worker = AddWorker(self._store_conteudo(), arquivo, destino, self)
+                worker.added.connect(self._programa_adicionado)
+                worker.failed.connect(
+                    lambda mensagem: QMessageBox.critical(self, "Erro", f"Não foi possível adicionar:\n{mensagem}")
+                )
+                worker.finished.connect(lambda: self.add_workers.discard(worker))
+                worker.finished.connect(worker.deleteLater)
+                self.add_workers.add(worker)
+                worker.start()
+
+    def _store_conteudo(self):
+        """ContentStore do Hub atual (recriado quando a pasta Hub muda)"""
+        if self.content_store is None or self.content_store.hub_dir != self.hub_dir:
+            self.content_store = ContentStore(self.hub_dir)
+        return self.content_store
+
+    def _programa_adicionado(self, resultado):
+        self._agendar_sincronizacao(os.path.dirname(resultado.path))
+        nome = os.path.basename(resultado.path)
+        if resultado.status == "stub":
+            nome += " (atalho para o conteúdo já guardado)"
+        self.status_label.setText(f"Programa adicionado: {nome}")
+        if resultado.duplicates:
+            self._avisar_duplicados([(os.path.relpath(resultado.path, self.hub_dir), resultado.duplicates)])
+
+    def _avisar_duplicados(self, duplicados):
+        """Informa arquivos com o mesmo conteúdo de outros já no Hub (guardados uma vez só)"""
+        linhas = "\n".join(f"{key} = {', '.join(iguais)}" for key, iguais in duplicados[:10])
+        if len(duplicados) > 10:
+            linhas += f"\n... e mais {len(duplicados) - 10}"
+        QMessageBox.information(
+            self, "Conteúdo duplicado",
+            f"Estes arquivos já existiam no Hub com outro nome ou categoria.\n"
+            f"O conteúdo foi guardado uma vez só:\n{linhas}"
+        )
 
     def abrir_programa(self, caminho):
         """Abre programa e atualiza contador"""
-        try:
-            subprocess.Popen(caminho, shell=True)
+        key = caminho.replace(self.hub_dir, "").strip(os.sep)
+        tags = self.program_info.get(key, {}).get('tags', [])
+        job = self.scheduler.submit(key, caminho, category=os.path.dirname(key), tags=tags,
+                                    **self._opcoes_lancamento(key))
+        if self.scheduler.is_queued(job):
+            self.status_label.setText(
+                f"Na fila: {os.path.basename(caminho)} ({self.scheduler.queued_count()} aguardando)"
+            )
+        self._atualizar_fila()
 
-            # Atualiza contador de execuções
-            key = caminho.replace(self.hub_dir, "").strip(os.sep)
+    def _programa_iniciado(self, job):
+        """Chamado pelo scheduler quando um job da fila é de fato lançado"""
+        key = job.key
+
+        # Lotes já contabilizaram as execuções ao serem enviados
+        if job.batch is None:
             if key not in self.program_info:
                 self.program_info[key] = {}
 
             self.program_info[key]['launch_count'] = self.program_info[key].get('launch_count', 0) + 1
             self.program_info[key]['last_opened'] = datetime.now().isoformat()
+            self.salvar_config([key])
+            self.atualizar_programa(key)
+
+        # Indicador fica aceso até o supervisor ver o processo terminar (não há o
+        # que acompanhar quando o lançador só solta o programa)
+        if job.record is None or job.record.tracked:
+            self.program_model.set_running(key, True)
+        self.status_label.setText(f"Abrindo: {os.path.basename(job.path)}")
+
+    def _erro_lancamento(self, job, erro):
+        if job.batch is not None:
+            self._avancar_lote()
+            self.status_label.setText(f"Falha ao abrir {os.path.basename(job.path)}: {erro}")
+        else:
+            QMessageBox.critical(self, "Erro", f"Não foi possível abrir:\n{erro}")
+        self._atualizar_fila()
 
-            # Marca item como em execução
-            for _, item, _ in self.botoes:
-                if hasattr(item, 'caminho') and item.caminho == caminho:
-                    item.set_running(True)
-                    # Remove indicador após 3 segundos
-                    from PySide6.QtCore import QTimer
-                    QTimer.singleShot(3000, lambda i=item: i.set_running(False))
-                    break
+    def _opcoes_lancamento(self, key):
+        """Parâmetros extras do supervisor para o programa (captura de saída)"""
+        if self.program_info.get(key, {}).get('capture_output'):
+            return {'log_path': log_path_for(key)}
+        return {}
+
+    def mostrar_log(self, caminho):
+        """Abre (ou traz para frente) o visualizador do log do programa"""
+        key = caminho.replace(self.hub_dir, "").strip(os.sep)
+        dialog = self.log_dialogs.get(key)
+        if dialog is None:
+            nome = self.program_info.get(key, {}).get('display_name') or os.path.basename(caminho)
+            dialog = LogTailDialog(log_path_for(key), nome, self)
+            dialog.finished.connect(lambda _, k=key: self.log_dialogs.pop(k, None))
+            self.log_dialogs[key] = dialog
+        dialog.show()
+        dialog.raise_()
+        dialog.activateWindow()
+
+    def executar_lote(self, caminhos):
+        """Enfileira vários programas com uma única atualização de metadados"""
+        if not caminhos:
+            return
+        agora = datetime.now().isoformat()
+        entradas = []
+        for caminho in caminhos:
+            key = caminho.replace(self.hub_dir, "").strip(os.sep)
+            info = self.program_info.setdefault(key, {})
+            info['launch_count'] = info.get('launch_count', 0) + 1
+            info['last_opened'] = agora
+            entradas.append((key, caminho, os.path.dirname(key), info.get('tags', []),
+                             self._opcoes_lancamento(key)))
+
+        keys = [entrada[0] for entrada in entradas]
+        self.salvar_config(keys)
+        for key in keys:
+            self.atualizar_programa(key)
+
+        self.lote_total += len(entradas)
+        self.progress_bar.setRange(0, self.lote_total)
+        self.progress_bar.setValue(self.lote_concluidos)
+        self.progress_bar.setVisible(True)
 
+        self.scheduler.submit_batch(entradas)
+        self._atualizar_fila()
+        self.status_label.setText(f"Lote enviado: {len(entradas)} programa(s)")
+
+    def _avancar_lote(self, quantidade=1):
+        """Progresso agregado dos lotes em andamento"""
+        if not self.lote_total:
+            return
+        self.lote_concluidos += quantidade
+        self.progress_bar.setValue(self.lote_concluidos)
+        if self.lote_concluidos >= self.lote_total:
+            self.status_label.setText(f"Lote concluído: {self.lote_total} programa(s)")
+            self.lote_total = self.lote_concluidos = 0
+            self.progress_bar.setVisible(False)
+
+    def executar_categoria(self, header_row):
+        """Roda todos os programas da categoria que passam no filtro atual"""
+        caminhos = []
+        for row_index in self.program_model.category_rows(header_row):
+            row = self.program_model.row_at(row_index)
+            if row.key not in self.keys_filtradas:
+                caminhos.append(row.caminho)
+        self.executar_lote(caminhos)
+
+    def show_category_menu(self, header_row):
+        """Menu de contexto do cabeçalho de categoria"""
+        header = self.program_model.row_at(header_row)
+        total = header.count if header.matches is None else header.matches
+        menu = QMenu(self)
+
+        run_action = menu.addAction(f"Executar todos ({total})")
+        run_action.setEnabled(total > 0)
+        run_action.triggered.connect(lambda: self.executar_categoria(header_row))
+
+        toggle_action = menu.addAction("Expandir" if header.collapsed else "Recolher")
+        toggle_action.triggered.connect(lambda: self.toggle_categoria(header_row))
+
+        menu.exec(QCursor.pos())
+
+    def _drenar_fila(self):
+        self.scheduler.drain()
+        self._atualizar_fila()
+
+    def _atualizar_fila(self):
+        """Sincroniza marcadores das linhas, botão da fila e timer do intervalo"""
+        na_fila = Counter(job.key for job in self.scheduler.queued())
+        for key in set(na_fila) | set(self.keys_na_fila):
+            if na_fila[key] != self.keys_na_fila[key]:
+                self.program_model.set_queued(key, na_fila[key])
+        self.keys_na_fila = na_fila
+
+        total = sum(na_fila.values())
+        self.btn_fila.setText(f"Fila: {total}")
+        self.btn_fila.setVisible(total > 0)
+
+        espera = self.scheduler.wait_time()
+        if total and espera > 0:
+            self.launch_timer.start(int(espera * 1000) + 10)
+
+    def mostrar_fila(self):
+        """Menu com os programas aguardando, permitindo cancelar"""
+        menu = QMenu(self)
+        fila = self.scheduler.queued()
+        for posicao, job in enumerate(fila[:30], 1):
+            nome = self.program_info.get(job.key, {}).get('display_name') or os.path.basename(job.path)
+            action = menu.addAction(f"{posicao}. Cancelar: {nome} ({job.category})")
+            action.triggered.connect(lambda checked=False, j=job: self.cancelar_fila(j))
+        if len(fila) > 30:
+            menu.addAction(f"... e mais {len(fila) - 30}").setEnabled(False)
+        menu.addSeparator()
+        cancel_all = menu.addAction("Cancelar todos")
+        cancel_all.triggered.connect(lambda: self.cancelar_fila())
+        limits_action = menu.addAction("Limites de execução...")
+        limits_action.triggered.connect(self.configurar_limites)
+        menu.exec(QCursor.pos())
+
+    def cancelar_fila(self, job=None):
+        if job is None:
+            jobs = self.scheduler.cancel_all()
+        else:
+            jobs = [job] if self.scheduler.cancel(job) else []
+        canceladas = len(jobs)
+        self._atualizar_fila()
+        self._avancar_lote(sum(1 for j in jobs if j.batch is not None))
+        self.status_label.setText(f"{canceladas} execução(ões) cancelada(s)")
+
+    def configurar_limites(self):
+        dialog = LaunchLimitsDialog(self.launch_limits, self)
+        if dialog.exec():
+            self.launch_limits = dialog.get_limits()
+            self.scheduler.configure(self.launch_limits)
             self.salvar_config()
-            self.status_label.setText(f"Abrindo: {os.path.basename(caminho)}")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Erro", f"Não foi possível abrir:\n{e}")
+            self._drenar_fila()
+
+    def _carregar_agendamentos(self):
+        """Agenda todos os programas com 'schedule', recuperando horários perdidos"""
+        for key, info in self.program_info.items():
+            if info.get('schedule'):
+                self._agendar(key)
+        self._armar_agendamentos()
+
+    def _agendar(self, key, recuperar=True):
+        """(Re)agenda o programa; com recuperar, horário perdido desde a última execução dispara já"""
+        info = self.program_info.get(key, {})
+        texto = info.get('schedule')
+        if not texto:
+            self.agendamentos.remove(key)
+            return
+        ultima = None
+        if recuperar and info.get('schedule_last'):
+            try:
+                ultima = datetime.fromisoformat(info['schedule_last'])
+            except ValueError:
+                pass
+        try:
+            self.agendamentos.set(key, parse_schedule(texto), last_run=ultima)
+        except ValueError:
+            self.agendamentos.remove(key)
+
+    def _armar_agendamentos(self):
+        """Arma o timer para o próximo disparo (no máximo 1 min, para notar suspensão e ajuste de relógio)"""
+        proximo = self.agendamentos.next_due()
+        if proximo is None:
+            self.schedule_timer.stop()
+            return
+        espera = (proximo - datetime.now()).total_seconds()
+        self.schedule_timer.start(int(min(max(espera, 0), 60) * 1000))
+
+    def _disparar_agendados(self):
+        agora = datetime.now()
+        disparados = []
+        for key in self.agendamentos.pop_due(agora):
+            caminho = os.path.join(self.hub_dir, key) if self.hub_dir else None
+            if not caminho or not os.path.exists(caminho):
+                continue
+            self.program_info.setdefault(key, {})['schedule_last'] = agora.isoformat()
+            self.abrir_programa(caminho)
+            disparados.append(key)
+        if disparados:
+            self.salvar_config(disparados)
+            self.status_label.setText(f"Agendamento: {len(disparados)} programa(s) enviados para execução")
+        self._armar_agendamentos()
+
+    def _recursos_medidos(self, amostras):
+        """Atualiza CPU/memória das linhas em execução (instâncias somadas por programa)"""
+        por_key = {}
+        for record, cpu, rss in amostras:
+            if not record.running:
+                continue
+            total_cpu, total_rss = por_key.get(record.key, (0.0, 0))
+            por_key[record.key] = (total_cpu + cpu, total_rss + rss)
+        for key, usage in por_key.items():
+            self.program_model.set_usage(key, usage)
+
+    def _processo_finalizado(self, record):
+        """Registra código de saída e duração quando um processo lançado termina"""
+        key = record.key
+        job = self.scheduler.finished(record)
+        self._atualizar_fila()
+        self.program_model.set_running(key, self.supervisor.running_count(key) > 0)
+        if not record.tracked:
+            # .lnk ou .bat com `start`: o fim do lançador não diz nada sobre o programa
+            self.status_label.setText(f"{os.path.basename(record.path)} aberto")
+            if job is not None and job.batch is not None:
+                self._avancar_lote()
+            return
+        if key in self.program_info:
+            self.program_info[key]['last_exit_code'] = record.exit_code
+            self.program_info[key]['last_duration'] = round(record.duration, 1)
+            self.salvar_config([key])
+        try:
+            self.history.append(key, record.started_at.timestamp(), record.duration,
+                                record.exit_code, record.peak_rss)
+        except OSError:
+            pass
+        self.status_label.setText(
+            f"{os.path.basename(record.path)} finalizado (código {record.exit_code}) "
+            f"em {record.duration:.1f}s"
+        )
+        if job is not None and job.batch is not None:
+            self._avancar_lote()
 
-    def show_context_menu(self, item, caminho):
+    def show_context_menu(self, caminho):
         """Mostra menu de contexto para o item"""
         menu = QMenu(self)
 
@@ -966,6 +2161,16 @@ class HubApp(QWidget):
         open_action.triggered.connect(lambda: self.abrir_programa(caminho))
         menu.addAction(open_action)
 
+        info_action = QAction("Informações", self)
+        info_action.triggered.connect(lambda: self.mostrar_informacoes(caminho))
+        menu.addAction(info_action)
+
+        selecionados = self.program_view.selected_paths()
+        if len(selecionados) > 1 and caminho in selecionados:
+            batch_action = QAction(f"Executar selecionados ({len(selecionados)})", self)
+            batch_action.triggered.connect(lambda: self.executar_lote(selecionados))
+            menu.addAction(batch_action)
+
         menu.addSeparator()
 
         edit_action = QAction("Editar", self)
@@ -976,6 +2181,12 @@ class HubApp(QWidget):
         favorite_action.triggered.connect(lambda: self.toggle_favorite(caminho))
         menu.addAction(favorite_action)
 
+        key = caminho.replace(self.hub_dir, "").strip(os.sep)
+        if self.program_info.get(key, {}).get('capture_output') or os.path.exists(log_path_for(key)):
+            log_action = QAction("Ver log", self)
+            log_action.triggered.connect(lambda: self.mostrar_log(caminho))
+            menu.addAction(log_action)
+
         menu.addSeparator()
 
         delete_action = QAction("Remover", self)
@@ -993,8 +2204,11 @@ class HubApp(QWidget):
         dialog = EditProgramDialog(program_data, self)
         if dialog.exec() == QDialog.Accepted:
             self.program_info[key] = {**program_data, **dialog.get_program_info()}
-            self.salvar_config()
-            self.carregar_programas()
+            if self.program_info[key].get('schedule') != program_data.get('schedule'):
+                self._agendar(key, recuperar=False)
+                self._armar_agendamentos()
+            self.salvar_config([key])
+            self.atualizar_programa(key)
 
     def toggle_favorite(self, caminho):
         """Alterna status de favorito"""
@@ -1004,8 +2218,8 @@ class HubApp(QWidget):
         
         current_fav = self.program_info[key].get('favorite', False)
         self.program_info[key]['favorite'] = not current_fav
-        self.salvar_config()
-        self.carregar_programas()
+        self.salvar_config([key])
+        self.atualizar_programa(key)
 
     def is_favorite(self, caminho):
         """Verifica se programa é favorito"""
@@ -1026,172 +2240,505 @@ class HubApp(QWidget):
             try:
                 os.remove(caminho)
                 key = caminho.replace(self.hub_dir, "").strip(os.sep)
+                store = self._store_conteudo()
+                store.forget(key)
+                store.save()
                 if key in self.program_info:
                     del self.program_info[key]
-                self.salvar_config()
-                self.carregar_programas()
+                self.salvar_config(removidas=[key])
+                self.history.delete(key)
+                self.agendamentos.remove(key)
+                self.hub_snapshot.pop(key, None)
+                self._remover_linha(key)
                 self.status_label.setText(f"Programa removido: {nome}")
             except Exception as e:
                 QMessageBox.critical(self, "Erro", f"Não foi possível remover:\n{e}")
 
     def carregar_programas(self):
-        """Carrega programas com melhor tratamento de erros e cache de ícones"""
+        """Relê a pasta Hub e aplica na lista apenas o que mudou"""
         if not self.hub_dir or not os.path.exists(self.hub_dir):
             self.status_label.setText("Pasta Hub não encontrada!")
             return
 
+        # Uma varredura em background que ainda não chegou fica obsoleta
+        self.scan_generation += 1
         self.progress_bar.setVisible(True)
         self.status_label.setText("Carregando programas...")
-        
-        # Limpa área
-        for i in reversed(range(self.scroll_layout.count())):
-            item = self.scroll_layout.itemAt(i).widget()
-            if item:
-                item.deleteLater()
-        self.botoes.clear()
-
-        total_programs = 0
-        program_paths = []
-        
-        # Conta programas primeiro
+
         try:
-            for categoria in os.listdir(self.hub_dir):
-                categoria_path = os.path.join(self.hub_dir, categoria)
-                if os.path.isdir(categoria_path):
-                    for arquivo in os.listdir(categoria_path):
-                        if arquivo.lower().endswith((".exe", ".lnk", ".bat", ".cmd")):
-                            total_programs += 1
-                            program_paths.append(os.path.join(categoria_path, arquivo))
+            snapshot = self.scanner.scan()
         except Exception as e:
             QMessageBox.warning(self, "Aviso", f"Erro ao ler diretório:\n{e}")
             self.progress_bar.setVisible(False)
             return
 
-        self.progress_bar.setMaximum(total_programs)
-        current_progress = 0
-
-        is_dark = self.current_theme == "dark"
-        self.categories = []
-
-        # Carrega programas
-        for categoria in sorted(os.listdir(self.hub_dir)):
-            categoria_path = os.path.join(self.hub_dir, categoria)
-            if os.path.isdir(categoria_path):
-                category_widget = CollapsibleCategory(categoria)
-                category_widget.set_theme(is_dark)
-                category_has_programs = False
-
-                for arquivo in sorted(os.listdir(categoria_path)):
-                    if arquivo.lower().endswith((".exe", ".lnk", ".bat", ".cmd", ".py")):
-                        category_has_programs = True
-                        caminho = os.path.join(categoria_path, arquivo)
-
-                        if not os.path.exists(caminho):
-                            current_progress += 1
-                            continue
-
-                        key = caminho.replace(self.hub_dir, "").strip(os.sep)
-                        program_data = self.program_info.get(key, {})
-
-                        nome = program_data.get('display_name') or os.path.splitext(arquivo)[0]
-                        descricao = program_data.get('description', '')
-
-                        # Tipo de arquivo
-                        ext = os.path.splitext(arquivo)[1].lower()
-                        tipo = ext[1:].upper() if ext else ""
-
-                        # Ultima execucao formatada
-                        last_opened = program_data.get('last_opened', '')
-                        last_run = ""
-                        if last_opened:
-                            try:
-                                dt = datetime.fromisoformat(last_opened)
-                                hoje = datetime.now().date()
-                                if dt.date() == hoje:
-                                    last_run = dt.strftime("%H:%M")
-                                else:
-                                    last_run = dt.strftime("%d/%m")
-                            except:
-                                pass
-
-                        tags = program_data.get('tags', [])
-                        item = ListItem(nome, descricao, tipo, last_run, tags)
-                        item.caminho = caminho
-                        item.set_theme(is_dark)
-                        item.set_favorite(program_data.get('favorite', False))
-
-                        # Icone - tenta detectar logo na pasta do programa
-                        icon_path = program_data.get('icon', '')
-                        if not icon_path or not os.path.exists(icon_path):
-                            # Tenta encontrar logo na pasta pai do .bat
-                            pasta_programa = os.path.dirname(caminho)
-                            icon_path = self._find_logo_in_folder(pasta_programa)
-
-                        if icon_path and os.path.exists(icon_path):
-                            icon = QIcon(icon_path)
-                        else:
-                            icon = QIcon(caminho)
-                        item.set_icon(icon)
-
-                        # Conecta eventos
-                        item.clicked.connect(lambda c=caminho: self.abrir_programa(c))
-                        item.rightClicked.connect(lambda i=item, c=caminho: self.show_context_menu(i, c))
-
-                        category_widget.add_item(item)
-                        self.botoes.append((nome.lower(), item, program_data))
-
-                        current_progress += 1
-                        self.progress_bar.setValue(current_progress)
-                        QApplication.processEvents()
-
-                if category_has_programs:
-                    self.scroll_layout.addWidget(category_widget)
-                    self.categories.append(category_widget)
+        self._aplicar_carga(snapshot)
+
+    def _aplicar_carga(self, snapshot):
+        self.hub_categorias = snapshot.category_names()
+        self.progress_bar.setMaximum(max(snapshot.total_programs, 1))
+        self._aplicar_varredura(snapshot.categories)
+        self._atualizar_watcher()
+        self.program_view.set_loading(False)
 
         self.progress_bar.setVisible(False)
-        self.status_label.setText(f"Carregados {total_programs} programas em {len([d for d in os.listdir(self.hub_dir) if os.path.isdir(os.path.join(self.hub_dir, d))])} categorias")
+        self.status_label.setText(f"Carregados {snapshot.total_programs} programas em {len(snapshot.categories)} categorias")
+
+    def carregar_em_segundo_plano(self):
+        """Varre o Hub numa thread; a lista mostra um esqueleto até o resultado chegar"""
+        if not self.hub_dir or not os.path.exists(self.hub_dir):
+            self.status_label.setText("Pasta Hub não encontrada!")
+            return
+        self.scan_generation += 1
+        anterior = self._mostrar_snapshot_salvo() if not self.hub_snapshot else None
+        if anterior is None:
+            self.program_view.set_loading(True)
+            self.status_label.setText("Carregando programas...")
+        self.btn_atualizar.setEnabled(False)
+        self.scan_worker = ScanWorker(self.hub_dir, self.scan_generation, anterior, self)
+        self.scan_worker.scanned.connect(self._varredura_concluida)
+        self.scan_worker.failed.connect(self._varredura_falhou)
+        self.scan_worker.finished.connect(self.scan_worker.deleteLater)
+        self.scan_worker.start()
+
+    def _varredura_concluida(self, generation, scanner, snapshot):
+        self.scan_worker = None
+        self.btn_atualizar.setEnabled(bool(self.hub_dir))
+        if generation != self.scan_generation or scanner.hub_dir != self.hub_dir:
+            return
+        # O scanner da thread já tem os mtimes e logos memorizados desta varredura
+        self.scanner = scanner
+        self._aplicar_carga(snapshot)
+        if 'pronto_ms' not in self.startup_metrics:
+            self._registrar_inicializacao(snapshot.total_programs)
+        self._salvar_snapshot()
+
+    def _mostrar_snapshot_salvo(self):
+        """Monta a lista com o snapshot da última sessão, sem ler o Hub.
+
+        Devolve (snapshot, logos) para a varredura em background conferir os
+        mtimes das pastas, ou None se não há snapshot deste Hub.
+        """
+        salvo = load_snapshot(self.hub_dir)
+        if salvo is None:
+            return None
+        snapshot, logos, icons = salvo
+        self.icon_refs.update(icons)
+        self.scanner.restore(snapshot, logos)
+        self._aplicar_carga(snapshot)
+        return snapshot, logos
+
+    def _salvar_snapshot(self):
+        """Grava a lista atual para a próxima partida abrir sem varrer o Hub"""
+        if not self.hub_dir:
+            return
+        programas = {nome: [] for nome in self.hub_categorias}
+        for categoria, arquivo, mtime, _ in self.hub_snapshot.values():
+            programas.setdefault(categoria, []).append((arquivo, mtime))
+        snapshot = HubSnapshot([
+            CategoryScan(nome, self.scanner.category_mtime(nome), sorted(lista))
+            for nome, lista in sorted(programas.items())
+        ])
+        # Só os ícones em uso; o PNG do cache já está no tamanho da lista
+        icons = {origem: png for origem, png in self.icon_refs.items() if self.icon_cache.get(origem)}
+        try:
+            save_snapshot(self.hub_dir, snapshot, self.scanner.logos(), icons)
+        except OSError:
+            pass
+
+    def _varredura_falhou(self, generation, mensagem):
+        self.scan_worker = None
+        self.btn_atualizar.setEnabled(bool(self.hub_dir))
+        self.program_view.set_loading(False)
+        if generation == self.scan_generation:
+            QMessageBox.warning(self, "Aviso", f"Erro ao ler diretório:\n{mensagem}")
+
+    def _janela_exibida(self):
+        """Marca quando a janela ficou visível; se não há Hub, ela já está pronta"""
+        if 'pronto_ms' in self.startup_metrics:
+            return
+        self.startup_metrics['janela_ms'] = round((time.perf_counter() - INICIO) * 1000)
+        if self.scan_worker is None:
+            self._registrar_inicializacao(None)
+        elif self.hub_snapshot:
+            # Lista veio do snapshot salvo: já está interativa enquanto a varredura confere
+            self.startup_metrics['snapshot'] = True
+            self._registrar_inicializacao(len(self.hub_snapshot))
+
+    def _registrar_inicializacao(self, programas):
+        """Tempo até a lista real estar interativa; fica no status e nas configurações"""
+        metrics = self.startup_metrics
+        metrics['pronto_ms'] = round((time.perf_counter() - INICIO) * 1000)
+        # Varredura que termina antes da primeira volta do loop: a janela aparece junto
+        metrics.setdefault('janela_ms', metrics['pronto_ms'])
+        if programas is not None:
+            metrics['programas'] = programas
+            self.status_label.setText(
+                f"{self.status_label.text()} - pronto em {metrics['pronto_ms']} ms "
+                f"(janela em {metrics['janela_ms']} ms)"
+            )
+        self.config_writer.set_settings(startup_metrics=metrics)
+
+    def _aplicar_varredura(self, categorias, afetadas=None):
+        """Compara a varredura com o snapshot e atualiza só as linhas que mudaram.
+
+        afetadas: categorias cobertas pela varredura (None = hub inteiro).
+        """
+        novo_snapshot = {}
+        for categoria in categorias:
+            for arquivo, mtime in categoria.programs:
+                key = os.path.join(categoria.name, arquivo)
+                novo_snapshot[key] = (categoria.name, arquivo, mtime, self._info_hash(key))
+
+        if afetadas is None:
+            antigos = self.hub_snapshot
+        else:
+            antigos = {key: entry for key, entry in self.hub_snapshot.items() if entry[0] in afetadas}
+        removidos = [key for key in antigos if key not in novo_snapshot]
+        adicionados = [key for key in novo_snapshot if key not in antigos]
+        alterados = [key for key, entry in novo_snapshot.items()
+                     if key in antigos and antigos[key] != entry]
+        total_mudancas = len(removidos) + len(adicionados) + len(alterados)
+
+        if afetadas is None and (not antigos or total_mudancas > max(64, len(novo_snapshot) // 4)):
+            # Muitas mudanças: mais barato reconstruir o modelo de uma vez
+            self.search_index.clear()
+            linhas = []
+            montadas = 0  # progresso acumulado no total do snapshot (setMaximum em _aplicar_carga)
+            for categoria in categorias:
+                if not categoria.programs:
+                    continue
+                programas = []
+                for arquivo, _ in categoria.programs:
+                    programas.append(self._montar_linha(os.path.join(categoria.name, arquivo)))
+                montadas += len(programas)
+                self.progress_bar.setValue(montadas)
+                linhas.append((categoria.name, programas))
+            self.program_model.set_categories(linhas)
+            # O reset do modelo limpa as linhas ocultas da view
+            self.linhas_ocultas.clear()
+            self.keys_filtradas.clear()
+            self.filtradas_por_categoria.clear()
+            self.hub_snapshot = novo_snapshot
+            self.filtrar_programas()
+            return total_mudancas
+
+        for key in removidos:
+            del self.hub_snapshot[key]
+            self._remover_linha(key)
+        self.hub_snapshot.update(novo_snapshot)
+        for key in adicionados:
+            index = self.program_model.insert_program(self._montar_linha(key))
+            self._aplicar_filtro_linha(index.row())
+        for key in alterados:
+            index = self.program_model.update_program(self._montar_linha(key))
+            self._aplicar_filtro_linha(index.row())
+        return total_mudancas
+
+    def _atualizar_watcher(self):
+        """Observa a pasta Hub e as categorias; o que o watcher recusar vai para o polling"""
+        desejadas = {os.path.normpath(self.hub_dir)}
+        desejadas.update(os.path.normpath(os.path.join(self.hub_dir, c)) for c in self.hub_categorias)
+
+        observadas = set(self.hub_watcher.directories())
+        obsoletas = list(observadas - desejadas)
+        if obsoletas:
+            self.hub_watcher.removePaths(obsoletas)
+        novas = list(desejadas - observadas - set(self.hub_poller.paths()))
+        falhas = self.hub_watcher.addPaths(novas) if novas else []
+
+        self.hub_poller.set_paths((set(self.hub_poller.paths()) & desejadas) | set(falhas))
+        if self.hub_poller.paths() and not self.hub_poller.isRunning():
+            self.hub_poller.start()
+
+    def _agendar_sincronizacao(self, paths):
+        """Acumula pastas alteradas e adia a sincronização (debounce)"""
+        if isinstance(paths, str):
+            paths = [paths]
+        self.pastas_pendentes.update(os.path.normpath(p) for p in paths)
+        self.sync_timer.start()
+
+    def _sincronizar_pastas(self):
+        """Relê apenas as pastas que mudaram desde a última sincronização"""
+        pendentes, self.pastas_pendentes = self.pastas_pendentes, set()
+        if not self.hub_dir or not os.path.isdir(self.hub_dir):
+            return
+
+        hub_dir = os.path.normpath(self.hub_dir)
+        afetadas = set()
+        try:
+            if hub_dir in pendentes:
+                # Categorias criadas ou removidas na raiz do Hub
+                categorias_atuais = [nome for nome, _ in self.scanner.list_categories()]
+                afetadas.update(set(categorias_atuais) ^ set(self.hub_categorias))
+                self.hub_categorias = categorias_atuais
+            for path in pendentes:
+                if os.path.dirname(path) == hub_dir:
+                    afetadas.add(os.path.basename(path))
+        except OSError:
+            return
+        if not afetadas:
+            return
+
+        existentes = set(self.hub_categorias)
+        snapshot = self.scanner.scan(sorted(c for c in afetadas if c in existentes))
+        mudancas = self._aplicar_varredura(snapshot.categories, afetadas)
+        self._atualizar_watcher()
+        if mudancas:
+            self.status_label.setText(
+                f"Sincronizado: {mudancas} alteração(ões) — {len(self.hub_snapshot)} programas "
+                f"em {len(self.hub_categorias)} categorias"
+            )
+
+    def _info_hash(self, key):
+        """Hash dos metadados de um programa, usado para detectar alterações"""
+        return hash(json.dumps(self.program_info.get(key, {}), sort_keys=True, default=str))
+
+    def _montar_linha(self, key):
+        """Cria a linha do modelo para o programa identificado por key"""
+        categoria, arquivo = os.path.split(key)
+        caminho = os.path.join(self.hub_dir, key)
+        program_data = self.program_info.get(key, {})
+
+        nome = program_data.get('display_name') or os.path.splitext(arquivo)[0]
+        descricao = program_data.get('description', '')
+
+        # Tipo de arquivo
+        ext = os.path.splitext(arquivo)[1].lower()
+        tipo = ext[1:].upper() if ext else ""
+
+        # Ultima execucao formatada
+        last_opened = program_data.get('last_opened', '')
+        last_run = ""
+        if last_opened:
+            try:
+                dt = datetime.fromisoformat(last_opened)
+                hoje = datetime.now().date()
+                if dt.date() == hoje:
+                    last_run = dt.strftime("%H:%M")
+                else:
+                    last_run = dt.strftime("%d/%m")
+            except:
+                pass
+
+        self.search_index.update(key, nome, descricao, program_data.get('tags', []), arquivo)
+
+        row = ProgramRow(
+            ProgramRow.PROGRAM, categoria, nome=nome, key=key, caminho=caminho,
+            descricao=descricao, tipo=tipo, last_run=last_run,
+            tags=program_data.get('tags', []),
+            favorite=program_data.get('favorite', False)
+        )
+        row.running = self.supervisor.running_count(key) > 0
+        row.queued = self.keys_na_fila[key]
+
+        # Icone - tenta detectar logo na pasta do programa
+        icon_path = program_data.get('icon', '')
+        if not icon_path or not os.path.exists(icon_path):
+            # Tenta encontrar logo na pasta pai do .bat
+            pasta_programa = os.path.dirname(caminho)
+            icon_path = self._find_logo_in_folder(pasta_programa)
+
+        if icon_path:
+            row.icon_source = icon_path
+            row.icon = self._solicitar_icone(icon_path, key)
+        return row
+
+    def _solicitar_icone(self, icon_path, key):
+        """Devolve o ícone em memória ou agenda a decodificação no IconLoader"""
+        if icon_path in self.icon_cache:
+            return self.icon_cache[icon_path]
+        if icon_path in self.icon_refs:
+            # PNG reduzido da sessão anterior: decodifica aqui mesmo, sem esperar o loader
+            image = QImage(self.icon_refs[icon_path])
+            if not image.isNull():
+                icon = QIcon(QPixmap.fromImage(image))
+                self.icon_cache[icon_path] = icon
+                return icon
+            del self.icon_refs[icon_path]
+        aguardando = self.icon_waiting.get(icon_path)
+        if aguardando is None:
+            self.icon_waiting[icon_path] = {key}
+            self.icon_loader.request(icon_path)
+        else:
+            aguardando.add(key)
+        return None
+
+    def _icone_carregado(self, icon_path, image, cached):
+        """Recebe o ícone decodificado e atualiza as linhas que o aguardavam"""
+        icon = QIcon(QPixmap.fromImage(image)) if not image.isNull() else None
+        self.icon_cache[icon_path] = icon
+        if cached:
+            self.icon_refs[icon_path] = cached
+        for key in self.icon_waiting.pop(icon_path, ()):
+            self.program_model.set_icon(key, icon)
+
+    def atualizar_programa(self, key):
+        """Atualiza só a linha de um programa após mudança nos metadados"""
+        entry = self.hub_snapshot.get(key)
+        if entry is None:
+            return
+        self.hub_snapshot[key] = entry[:3] + (self._info_hash(key),)
+        index = self.program_model.update_program(self._montar_linha(key))
+        if index.isValid():
+            self._aplicar_filtro_linha(index.row())
+
+    def toggle_categoria(self, header_row):
+        """Expande/colapsa uma categoria escondendo as linhas dos seus programas"""
+        header = self.program_model.row_at(header_row)
+        header.collapsed = not header.collapsed
+        for row_index in self.program_model.category_rows(header_row):
+            row = self.program_model.row_at(row_index)
+            self._definir_oculta(row_index, row.key, header.collapsed or row.key in self.keys_filtradas)
+        index = self.program_model.index(header_row)
+        self.program_model.dataChanged.emit(index, index)
+
+    def _remover_linha(self, key):
+        """Remove um programa da lista mantendo busca, filtro e contadores coerentes"""
+        self.search_index.remove(key)
+        self.linhas_ocultas.discard(key)
+        if key in self.keys_filtradas:
+            self.keys_filtradas.discard(key)
+            self.filtradas_por_categoria[os.path.dirname(key)] -= 1
+        self.program_model.remove_program(key)
+        categoria = os.path.dirname(key)
+        if self.program_model.header_index(categoria).isValid():
+            self._atualizar_cabecalho(categoria)
+        else:
+            self.linhas_ocultas.discard((ProgramRow.CATEGORY, categoria))
+            self.filtradas_por_categoria.pop(categoria, None)
+
+    def _definir_oculta(self, row_index, ident, hide):
+        """Só chama setRowHidden quando a visibilidade da linha realmente muda"""
+        if (ident in self.linhas_ocultas) == hide:
+            return
+        if hide:
+            self.linhas_ocultas.add(ident)
+        else:
+            self.linhas_ocultas.discard(ident)
+        self.program_view.setRowHidden(row_index, hide)
+
+    def _filtro_ativo(self):
+        return bool(self.search_bar.text().strip()) or self.filter_combo.currentText() != "Todos"
+
+    def _atualizar_cabecalho(self, categoria, ativo=None):
+        """Atualiza a contagem de resultados e esconde categorias sem nenhum"""
+        index = self.program_model.header_index(categoria)
+        if not index.isValid():
+            return
+        header = self.program_model.row_at(index.row())
+        if ativo is None:
+            ativo = self._filtro_ativo()
+        matches = header.count - self.filtradas_por_categoria[categoria] if ativo else None
+        self._definir_oculta(index.row(), (ProgramRow.CATEGORY, categoria), ativo and not matches)
+        if header.matches != matches:
+            header.matches = matches
+            self.program_model.dataChanged.emit(index, index)
+
+    def _marcar_filtrada(self, row, filtrada):
+        if filtrada == (row.key in self.keys_filtradas):
+            return
+        if filtrada:
+            self.keys_filtradas.add(row.key)
+            self.filtradas_por_categoria[row.category] += 1
+        else:
+            self.keys_filtradas.discard(row.key)
+            self.filtradas_por_categoria[row.category] -= 1
+
+    def _aplicar_filtro_linha(self, row_index):
+        """Reavalia a visibilidade de uma única linha de programa"""
+        row = self.program_model.row_at(row_index)
+        header = self.program_model.row_at(self.program_model.header_index(row.category).row())
+        texto = self.search_bar.text().lower().strip()
+        ranks = self.ranks_busca if texto else None
+        if ranks is not None:
+            # A linha pode ser nova ou ter mudado depois da busca: repontua só ela com
+            # a mesma regra da busca completa e decide pela presença nos ranks
+            exatas = any(score > SearchIndex.FUZZY_MAX_SCORE for score in ranks.values())
+            score = self.search_index.score(row.key, texto, fuzzy=not exatas)
+            if score:
+                ranks[row.key] = score
+            else:
+                ranks.pop(row.key, None)
+        filtrada = not self._filtro_aceita(row, texto, self.filter_combo.currentText(), ranks)
+        self._marcar_filtrada(row, filtrada)
+        self._definir_oculta(row_index, row.key, filtrada or header.collapsed)
+        self._atualizar_cabecalho(row.category)
+
+    def _filtro_aceita(self, row, texto, filtro, ranks=None):
+        program_data = self.program_info.get(row.key, {})
+
+        # Filtro por texto (nome, descrição, tags e arquivo, via índice de busca)
+        if texto:
+            if ranks is not None:
+                if row.key not in ranks:
+                    return False
+            elif not self.search_index.score(row.key, texto):
+                return False
+
+        # Filtro por tipo
+        if filtro == "Favoritos" and not program_data.get('favorite', False):
+            return False
+        elif filtro == "Recentes" and not program_data.get('last_opened'):
+            return False
+        return True
+
+    def _agendar_filtro(self):
+        """Agrupa as teclas digitadas numa única busca"""
+        self.filter_timer.start()
 
     def filtrar_programas(self):
-        """Filtra programas por texto e filtros"""
-        texto = self.search_bar.text().lower()
-        filtro = self.filter_combo.currentText()
-        
-        for nome, btn, program_data in self.botoes:
-            show = True
-            
-            # Filtro por texto
-            if texto and texto not in nome:
-                show = False
-            
-            # Filtro por tipo
-            if filtro == "Favoritos" and not program_data.get('favorite', False):
-                show = False
-            elif filtro == "Recentes" and not program_data.get('last_opened'):
-                show = False
-            
-            btn.setVisible(show)
+        """Filtra programas por texto e filtros (a busca roda na SearchWorker)"""
+        texto = self.search_bar.text().lower().strip()
+        self.filter_timer.stop()
+        self.filter_generation += 1
+        if texto:
+            self.search_worker.request(self.filter_generation, texto)
+        else:
+            self._aplicar_filtro(None)
 
+    def _resultado_busca(self, generation, results):
+        # Resultado de uma busca já superada por outra digitação
+        if generation == self.filter_generation:
+            self._aplicar_filtro(dict(results))
+
+    def _aplicar_filtro(self, ranks):
+        """Aplica o resultado da busca alterando só as linhas cuja visibilidade mudou"""
+        texto = self.search_bar.text().lower().strip()
+        filtro = self.filter_combo.currentText()
+        self.ranks_busca = ranks
+
+        # Resultado ranqueado reordena a lista; sem texto volta à ordem alfabética
+        self.program_model.apply_ranking(ranks)
+
+        ativo = self._filtro_ativo()
+        collapsed = False
+        categorias = []
+        for row_index, row in enumerate(self.program_model.rows()):
+            if row.kind == ProgramRow.CATEGORY:
+                collapsed = row.collapsed
+                categorias.append(row.category)
+                continue
+            filtrada = not self._filtro_aceita(row, texto, filtro, ranks)
+            self._marcar_filtrada(row, filtrada)
+            self._definir_oculta(row_index, row.key, filtrada or collapsed)
+        for categoria in categorias:
+            self._atualizar_cabecalho(categoria, ativo)
 
 def main():
     app = QApplication(sys.argv)
     
     # Splash screen com logo
-    logo_path = os.path.join(ASSETS_DIR, "logolibby.png")
-    pixmap = QPixmap(logo_path)
+    pixmap = carregar_asset("logolibby.png", 300)
     if pixmap.isNull():
         pixmap = QPixmap(200, 200)
         pixmap.fill(QColor("#0078d4"))
-    else:
-        pixmap = pixmap.scaled(300, 300, Qt.KeepAspectRatio, Qt.SmoothTransformation)
 
     splash = QSplashScreen(pixmap)
     splash.show()
     app.processEvents()
-    
-    # Simula carregamento
-    import time
-    time.sleep(0.5)
-    
+
+    # A janela aparece já; a varredura do Hub termina em background
     window = HubApp()
     window.show()
     splash.finish(window)
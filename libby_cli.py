@@ -0,0 +1,7 @@
+"""Libby sem interface gráfica: python libby_cli.py --help"""
+import sys
+
+from libby_core.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Núcleo do Libby sem dependência de Qt (compartilhado entre interface e CLI)"""
@@ -0,0 +1,305 @@
+"""Linha de comando do Libby: usa o mesmo scanner, store e supervisor da interface, sem Qt.
+
+Os módulos são importados dentro de cada comando para a partida ficar rápida
+(scripts podem chamar o CLI em laço).
+"""
+import argparse
+import os
+import sys
+
+
+def _open(args):
+    """(store, settings, program_info, hub_dir) conforme --hub ou a configuração salva"""
+    from libby_core.store import open_store
+
+    store = open_store()
+    settings, program_info = store.load()
+    hub_dir = args.hub or os.environ.get("LIBBY_HUB") or settings.get("hub_dir")
+    if not hub_dir or not os.path.isdir(hub_dir):
+        store.close()
+        raise SystemExit("libby: pasta Hub não encontrada (use --hub ou escolha uma na interface)")
+    return store, settings, program_info, hub_dir
+
+
+def _programs(hub_dir, categories=None):
+    """Lista de (key, categoria, arquivo) dos programas do Hub"""
+    from libby_core.scanner import HubScanner
+
+    snapshot = HubScanner(hub_dir).scan(categories)
+    return [(os.path.join(cat.name, filename), cat.name, filename)
+            for cat in snapshot.categories for filename, _ in cat.programs]
+
+
+def _describe(key, filename, program_info):
+    info = program_info.get(key, {})
+    return {
+        "key": key,
+        "name": info.get("display_name") or os.path.splitext(filename)[0],
+        "tags": info.get("tags", []),
+        "favorite": info.get("favorite", False),
+        "launch_count": info.get("launch_count", 0),
+        "last_opened": info.get("last_opened"),
+    }
+
+
+def _print_rows(rows, columns, as_json):
+    if as_json:
+        import json
+        json.dump(rows, sys.stdout, ensure_ascii=False, indent=2, default=str)
+        sys.stdout.write("\n")
+        return
+    for row in rows:
+        print("\t".join("" if row.get(c) is None else
+                        ",".join(row[c]) if isinstance(row[c], list) else str(row[c])
+                        for c in columns))
+
+
+def cmd_list(args):
+    store, _, program_info, hub_dir = _open(args)
+    store.close()
+    categories = [args.category] if args.category else None
+    rows = [_describe(key, filename, program_info) for key, _, filename in _programs(hub_dir, categories)]
+    _print_rows(rows, ("key", "name", "tags"), args.json)
+    return 0
+
+
+def cmd_search(args):
+    from libby_core.search import SearchIndex
+
+    store, _, program_info, hub_dir = _open(args)
+    store.close()
+    index = SearchIndex()
+    names = {}
+    for key, _, filename in _programs(hub_dir):
+        info = program_info.get(key, {})
+        names[key] = filename
+        index.update(key, info.get("display_name") or os.path.splitext(filename)[0],
+                     info.get("description", ""), info.get("tags", []), filename)
+    rows = []
+    for key, score in index.search(" ".join(args.query), limit=args.limit):
+        row = _describe(key, names[key], program_info)
+        row["score"] = score
+        rows.append(row)
+    _print_rows(rows, ("key", "name", "score"), args.json)
+    return 0 if rows else 1
+
+
+class _Runner:
+    """Lança programas pelo LaunchScheduler e espera os processos terminarem"""
+
+    def __init__(self, store, settings, program_info, hub_dir, max_running=None, capture=True):
+        import queue
+        from libby_core.history import RunHistory
+        from libby_core.process import ProcessSupervisor
+        from libby_core.resources import ResourceSampler
+        from libby_core.scheduler import LaunchScheduler
+
+        self.store = store
+        self.program_info = program_info
+        self.hub_dir = hub_dir
+        self.capture = capture
+        self.exits = queue.Queue()
+        self.history = RunHistory()
+        self.supervisor = ProcessSupervisor(on_exit=self.exits.put)
+        self.sampler = ResourceSampler(self.supervisor)
+        self.sampler.start()
+        limits = dict(settings.get("launch_limits", {}))
+        if max_running is not None:
+            limits["max_running"] = max_running
+        self.scheduler = LaunchScheduler(self.supervisor, limits, on_error=self._failed)
+        self.failures = 0
+        self.last_exit = 0
+
+    def _failed(self, job, error):
+        print(f"libby: não foi possível abrir {job.key}: {error}", file=sys.stderr)
+        self.failures += 1
+
+    def _options(self, key):
+        from libby_core.logs import log_path_for
+
+        if self.capture and self.program_info.get(key, {}).get("capture_output"):
+            return {"log_path": log_path_for(key)}
+        return {}
+
+    def submit(self, keys):
+        """Conta as execuções (uma gravação) e enfileira os programas"""
+        from datetime import datetime
+        from libby_core.store import Increment
+
+        agora = datetime.now().isoformat()
+        entries = []
+        updates = {}
+        for key in keys:
+            info = self.program_info.setdefault(key, {})
+            info["launch_count"] = info.get("launch_count", 0) + 1
+            info["last_opened"] = agora
+            # Só estes campos, somando ao gravado: a interface pode estar aberta
+            updates.setdefault(key, {"launch_count": Increment(0), "last_opened": agora})
+            updates[key]["launch_count"] = Increment(updates[key]["launch_count"].delta + 1)
+            entries.append((key, os.path.join(self.hub_dir, key), os.path.dirname(key),
+                            info.get("tags", []), self._options(key)))
+        self.store.commit(updates=updates)
+        self.scheduler.submit_batch(entries)
+
+    def wait(self):
+        """Espera a fila esvaziar e todos terminarem; grava histórico e último código"""
+        import queue
+
+        finished = {}
+        while self.scheduler.queued_count() or self.scheduler.active() or self.supervisor.running():
+            try:
+                record = self.exits.get(timeout=self.scheduler.wait_time() or 0.5)
+            except queue.Empty:
+                self.scheduler.drain()
+                continue
+            self.scheduler.finished(record)
+            if not record.tracked:
+                print(f"{record.key}\taberto (sem acompanhamento)")
+                continue
+            self.last_exit = record.exit_code
+            if record.exit_code:
+                self.failures += 1
+            info = self.program_info.setdefault(record.key, {})
+            info["last_exit_code"] = record.exit_code
+            info["last_duration"] = round(record.duration, 1)
+            finished[record.key] = {"last_exit_code": info["last_exit_code"],
+                                    "last_duration": info["last_duration"]}
+            self.history.append(record.key, record.started_at.timestamp(), record.duration,
+                                record.exit_code, record.peak_rss)
+            print(f"{record.key}\tcódigo {record.exit_code}\t{record.duration:.1f}s")
+        if finished:
+            self.store.commit(updates=finished)
+        self.sampler.stop()
+        self.supervisor.stop()
+
+
+def cmd_run(args):
+    store, settings, program_info, hub_dir = _open(args)
+    try:
+        if not os.path.isfile(os.path.join(hub_dir, args.key)):
+            print(f"libby: programa não encontrado: {args.key}", file=sys.stderr)
+            return 2
+        runner = _Runner(store, settings, program_info, hub_dir, capture=args.wait)
+        runner.submit([args.key])
+        if not args.wait:
+            return 1 if runner.failures else 0
+        runner.wait()
+        return runner.last_exit or (1 if runner.failures else 0)
+    finally:
+        store.close()
+
+
+def cmd_run_category(args):
+    store, settings, program_info, hub_dir = _open(args)
+    try:
+        keys = [key for key, _, _ in _programs(hub_dir, [args.category])]
+        if not keys:
+            print(f"libby: categoria vazia ou inexistente: {args.category}", file=sys.stderr)
+            return 2
+        runner = _Runner(store, settings, program_info, hub_dir, max_running=args.max)
+        runner.submit(keys)
+        runner.wait()
+        print(f"{len(keys)} programa(s), {runner.failures} falha(s)")
+        return 1 if runner.failures else 0
+    finally:
+        store.close()
+
+
+def cmd_stats(args):
+    from libby_core.history import RunHistory
+
+    store, _, program_info, hub_dir = _open(args)
+    store.close()
+    history = RunHistory()
+    keys = [args.key] if args.key else [key for key, _, _ in _programs(hub_dir)]
+    rows = []
+    for key in keys:
+        stats = history.stats(key)
+        if not stats:
+            continue
+        last = stats.pop("last")
+        stats.update(key=key, last_exit_code=last.exit_code, last_duration=round(last.duration, 1),
+                     failure_rate=round(stats["failure_rate"], 3))
+        for field in ("p50", "p95", "p50_recent", "max_duration"):
+            stats[field] = round(stats[field], 1)
+        rows.append(stats)
+    _print_rows(rows, ("key", "runs", "p50", "p95", "failure_rate", "last_exit_code"), args.json)
+    return 0 if rows else 1
+
+
+def cmd_import(args):
+    from libby_core.importer import IGNORE_GLOBS, IMPORT_DEPTH, import_folder
+
+    store, settings, program_info, hub_dir = _open(args)
+    try:
+        pasta = os.path.abspath(args.folder)
+        if not os.path.isdir(pasta):
+            print(f"libby: pasta não encontrada: {args.folder}", file=sys.stderr)
+            return 2
+        categoria = args.category or os.path.basename(pasta)
+        depth = args.depth if args.depth is not None else int(settings.get("import_depth", IMPORT_DEPTH))
+        ignore = list(settings.get("import_ignore", IGNORE_GLOBS)) + args.ignore
+        importados, metadados, falhas, duplicados = import_folder(pasta, hub_dir, categoria,
+                                                                  depth=depth, ignore=ignore)
+        for item, erro in falhas:
+            print(f"libby: não foi possível importar {item}: {erro}", file=sys.stderr)
+        for key, iguais in duplicados:
+            print(f"{key}: mesmo conteúdo que {', '.join(iguais)} (guardado uma vez)")
+        for key, dados in metadados.items():
+            program_info.setdefault(key, {}).update(dados)
+        if metadados:
+            store.commit(updates=metadados)
+        print(f"Importados {importados} programas em '{categoria}'")
+        return 1 if falhas else 0
+    finally:
+        store.close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="libby", description="Libby sem interface gráfica")
+    parser.add_argument("--hub", help="pasta Hub (padrão: a escolhida na interface ou $LIBBY_HUB)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("list", help="lista os programas")
+    p.add_argument("-c", "--category", help="só uma categoria")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("search", help="busca por nome, tags, arquivo e descrição")
+    p.add_argument("query", nargs="+")
+    p.add_argument("-n", "--limit", type=int, default=20)
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser("run", help="executa um programa pela key (Categoria/arquivo)")
+    p.add_argument("key")
+    p.add_argument("-w", "--wait", action="store_true",
+                   help="espera terminar, registra o histórico e sai com o código do programa "
+                        "(a captura de saída só vale com --wait)")
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser("run-category", help="executa todos os programas de uma categoria e espera")
+    p.add_argument("category")
+    p.add_argument("--max", type=int, help="máximo simultâneo (padrão: limites da interface)")
+    p.set_defaults(func=cmd_run_category)
+
+    p = sub.add_parser("stats", help="estatísticas do histórico de execuções")
+    p.add_argument("key", nargs="?")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("import", help="importa uma pasta de automações para uma categoria")
+    p.add_argument("folder")
+    p.add_argument("-c", "--category", help="nome da categoria (padrão: nome da pasta)")
+    p.add_argument("--depth", type=int, help="níveis de subpastas percorridos (padrão: 4)")
+    p.add_argument("--ignore", action="append", default=[], metavar="GLOB",
+                   help="pasta a pular, além de venv, .git, node_modules etc. (pode repetir)")
+    p.set_defaults(func=cmd_import)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if getattr(args, "key", None):
+        args.key = args.key.replace("/", os.sep)
+    return args.func(args)
@@ -0,0 +1,205 @@
+import bisect
+import heapq
+import itertools
+import re
+from datetime import datetime, timedelta
+
+# Atalhos aceitos além das 5 colunas do cron
+MACROS = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def _parse_field(text, minimum, maximum):
+    """Converte '1-5', '*/15', '0,30' etc. no conjunto de valores aceitos"""
+    values = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step <= 0:
+                raise ValueError(f"passo inválido: {text}")
+        if part == "*":
+            start, end = minimum, maximum
+        elif "-" in part:
+            start, end = (int(v) for v in part.split("-", 1))
+        else:
+            start = int(part)
+            end = maximum if step > 1 else start
+        if start < minimum or end > maximum or start > end:
+            raise ValueError(f"valor fora do intervalo {minimum}-{maximum}: {text}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronExpression:
+    """Expressão cron de 5 colunas: minuto hora dia mês dia-da-semana (0 ou 7 = domingo)"""
+
+    def __init__(self, text):
+        self.text = text
+        fields = MACROS.get(text, text).split()
+        if len(fields) != 5:
+            raise ValueError("use 5 colunas: minuto hora dia mês dia-da-semana")
+        try:
+            self.minutes = _parse_field(fields[0], 0, 59)
+            self.hours = _parse_field(fields[1], 0, 23)
+            self.days = _parse_field(fields[2], 1, 31)
+            self.months = _parse_field(fields[3], 1, 12)
+            weekdays = _parse_field(fields[4], 0, 7)
+        except ValueError as e:
+            raise ValueError(f"cron inválido: {e}") from None
+        # cron usa 0 = domingo; datetime.weekday() usa 0 = segunda
+        self.weekdays = {(d - 1) % 7 for d in weekdays}
+        # Com dia e dia-da-semana restritos, basta um dos dois casar (como no cron)
+        self._any_day = fields[2] != "*" and fields[4] != "*"
+        self._hour_list = sorted(self.hours)
+        self._minute_list = sorted(self.minutes)
+
+    def _day_matches(self, dt):
+        day = dt.day in self.days
+        weekday = dt.weekday() in self.weekdays
+        return (day or weekday) if self._any_day else (day and weekday)
+
+    def next_after(self, dt):
+        """Primeiro horário que casa estritamente depois de dt"""
+        dt = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt.year + 5
+        while dt.year <= limit:
+            if dt.month not in self.months:
+                dt = (dt.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+                continue
+            if not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if dt.hour not in self.hours:
+                # Pula direto para a próxima hora válida do dia (ou para o dia seguinte)
+                i = bisect.bisect_right(self._hour_list, dt.hour)
+                if i == len(self._hour_list):
+                    dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+                else:
+                    dt = dt.replace(hour=self._hour_list[i], minute=0)
+                continue
+            if dt.minute not in self.minutes:
+                i = bisect.bisect_right(self._minute_list, dt.minute)
+                if i == len(self._minute_list):
+                    dt = dt.replace(minute=0) + timedelta(hours=1)
+                else:
+                    dt = dt.replace(minute=self._minute_list[i])
+                continue
+            return dt
+        raise ValueError(f"cron sem horário possível: {self.text}")
+
+    def __str__(self):
+        return self.text
+
+
+class IntervalSchedule:
+    """Execução a cada N segundos/minutos/horas/dias ('@every 30m')"""
+
+    def __init__(self, text, seconds):
+        self.text = text
+        self.seconds = seconds
+
+    def next_after(self, dt):
+        return dt + timedelta(seconds=self.seconds)
+
+    def __str__(self):
+        return self.text
+
+
+def parse_schedule(text):
+    """CronExpression ou IntervalSchedule; ValueError com a explicação se inválido"""
+    text = " ".join(text.split())
+    match = re.fullmatch(r"@every (\d+)\s*([smhd])", text)
+    if match:
+        seconds = int(match.group(1)) * UNITS[match.group(2)]
+        if seconds < 60:
+            raise ValueError("intervalo mínimo é de 1 minuto")
+        return IntervalSchedule(text, seconds)
+    if text.startswith("@every"):
+        raise ValueError("use @every seguido de número e unidade (s, m, h, d), ex.: @every 30m")
+    return CronExpression(text)
+
+
+class ScheduleQueue:
+    """Heap com a próxima execução de cada programa agendado.
+
+    Agendar, remover e disparar custam O(log n); entradas antigas ficam no
+    heap e são descartadas ao chegar no topo (invalidadas pela geração).
+    Execuções perdidas (PC dormindo, Libby fechado) viram um único disparo.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._entries = {}  # key -> (schedule, geração, próximo disparo)
+        self._generation = itertools.count()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def set(self, key, schedule, last_run=None, now=None):
+        """(Re)agenda o programa; last_run permite recuperar execuções perdidas"""
+        now = now or datetime.now()
+        if last_run is not None and last_run < now:
+            # Horário perdido desde a última execução dispara agora (uma vez só)
+            due = max(schedule.next_after(last_run), now)
+        else:
+            due = schedule.next_after(now)
+        self._push(key, schedule, due)
+        return due
+
+    def _push(self, key, schedule, due):
+        generation = next(self._generation)
+        self._entries[key] = (schedule, generation, due)
+        heapq.heappush(self._heap, (due, generation, key))
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            # Muitas entradas antigas: reconstrói só com as válidas
+            self._heap = [(d, g, k) for k, (_, g, d) in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def remove(self, key):
+        self._entries.pop(key, None)
+
+    def schedule_for(self, key):
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def _clean_top(self):
+        heap = self._heap
+        while heap:
+            _, generation, key = heap[0]
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == generation:
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+
+    def next_due(self, key=None):
+        """Próximo disparo (de todos ou, com key, do programa)"""
+        if key is None:
+            top = self._clean_top()
+            return top[0] if top else None
+        entry = self._entries.get(key)
+        return entry[2] if entry else None
+
+    def pop_due(self, now=None):
+        """Keys vencidas até agora; cada uma é reagendada a partir de now"""
+        now = now or datetime.now()
+        due_keys = []
+        while True:
+            top = self._clean_top()
+            if top is None or top[0] > now:
+                break
+            _, _, key = heapq.heappop(self._heap)
+            schedule = self._entries[key][0]
+            self._push(key, schedule, schedule.next_after(now))
+            due_keys.append(key)
+        return due_keys
@@ -0,0 +1,161 @@
+import errno
+import hashlib
+import json
+import os
+import threading
+from collections import namedtuple
+from shutil import copy2
+
+# Pasta do Hub com o conteúdo deduplicado (pastas com ponto não viram categoria)
+STORE_DIRNAME = ".libby_store"
+# Arquivos menores são só copiados: deduplicar scripts pequenos não compensa
+# e um hardlink faria a edição de um .bat valer para todas as categorias
+MIN_SIZE = 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+# Erros de os.link que significam "este sistema de arquivos não aceita hardlink"
+# (outro disco, FAT/exFAT, compartilhamento de rede, limite de links); os demais sobem
+LINK_UNSUPPORTED = {errno.EXDEV, errno.EPERM, errno.ENOTSUP, errno.EOPNOTSUPP, errno.EMLINK}
+# No Windows o FAT responde ERROR_INVALID_FUNCTION
+WINERROR_INVALID_FUNCTION = 1
+
+# path: arquivo criado no Hub; status: "copia", "novo", "link" ou "stub";
+# duplicates: keys do Hub que já tinham o mesmo conteúdo
+StoreResult = namedtuple("StoreResult", "path status duplicates")
+
+
+def hash_file(path, chunk_size=CHUNK_SIZE):
+    """SHA-256 do arquivo lido em blocos (memória constante para .exe grandes)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for bloco in iter(lambda: f.read(chunk_size), b""):
+            digest.update(bloco)
+    return digest.hexdigest()
+
+
+def stub_content(blob, ext):
+    """.bat que roda o conteúdo guardado quando não dá para criar hardlink (None se não há como)"""
+    if ext == ".exe":
+        comando = f'"{blob}" %*'
+    elif ext == ".py":
+        comando = f'python "{blob}" %*'
+    elif ext in (".bat", ".cmd"):
+        comando = f'call "{blob}" %*'
+    else:
+        return None
+    return f"@echo off\n{comando}\n"
+
+
+class ContentStore:
+    """Armazena cada conteúdo uma vez em <hub>/.libby_store, endereçado pelo SHA-256.
+
+    Os arquivos das categorias são hardlinks para o objeto guardado; onde o
+    sistema de arquivos não aceita hardlink, vira um .bat que chama o objeto.
+    O índice (key -> hash) fica em index.json e é gravado por save().
+    Seguro para várias threads (o importer adiciona em paralelo).
+    """
+
+    def __init__(self, hub_dir, min_size=MIN_SIZE):
+        self.hub_dir = hub_dir
+        self.root = os.path.join(hub_dir, STORE_DIRNAME)
+        self.index_path = os.path.join(self.root, "index.json")
+        self.min_size = min_size
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                self._files = json.load(f)
+        except (OSError, ValueError):
+            self._files = {}
+
+    def blob_path(self, digest, ext):
+        return os.path.join(self.root, "objects", digest[:2], digest + ext)
+
+    @staticmethod
+    def _replace(criar, destino):
+        """Cria com nome temporário e troca: substitui destino sem escrever dentro dele
+        (se destino for hardlink de outro objeto, o objeto guardado fica intacto)"""
+        temp = f"{destino}.{threading.get_ident()}.tmp"
+        criar(temp)
+        try:
+            os.replace(temp, destino)
+        except OSError:
+            os.remove(temp)
+            raise
+
+    def add(self, source, destino):
+        """Coloca source no Hub em destino (StoreResult); o hash roda na thread que chamar
+
+        Um destino que já existe é substituído, como faria a cópia.
+        """
+        ext = os.path.splitext(destino)[1].lower()
+        if os.stat(source).st_size < self.min_size:
+            self._replace(lambda temp: copy2(source, temp), destino)
+            return StoreResult(destino, "copia", [])
+
+        digest = hash_file(source)
+        blob = self.blob_path(digest, ext)
+        status = "link"
+        if not os.path.exists(blob):
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            temp = f"{blob}.{threading.get_ident()}.tmp"
+            copy2(source, temp)
+            os.replace(temp, blob)
+            status = "novo"
+
+        if os.path.exists(destino) and os.path.samefile(blob, destino):
+            pass  # já é o hardlink deste conteúdo
+        else:
+            try:
+                self._replace(lambda temp: os.link(blob, temp), destino)
+            except OSError as e:
+                if e.errno not in LINK_UNSUPPORTED and \
+                        getattr(e, "winerror", None) != WINERROR_INVALID_FUNCTION:
+                    raise
+                conteudo = stub_content(blob, ext)
+                stub = os.path.splitext(destino)[0] + ".bat"
+                # Destino já existente é substituído pela cópia: um stub ao lado o duplicaria
+                if conteudo is None or os.path.exists(stub) or os.path.exists(destino):
+                    self._replace(lambda temp: copy2(blob, temp), destino)
+                    status = "copia"
+                else:
+                    with open(stub, "w") as f:
+                        f.write(conteudo)
+                    destino, status = stub, "stub"
+
+        key = os.path.relpath(destino, self.hub_dir)
+        with self._lock:
+            duplicates = sorted(k for k, h in self._files.items() if h == digest and k != key)
+            self._files[key] = digest
+            self._dirty = True
+        return StoreResult(destino, status, duplicates)
+
+    def forget(self, key):
+        """Esquece o arquivo removido do Hub; apaga o objeto se ninguém mais o usa"""
+        with self._lock:
+            digest = self._files.pop(key, None)
+            if digest is None:
+                return
+            self._dirty = True
+            if digest in self._files.values():
+                return
+        pasta = os.path.join(self.root, "objects", digest[:2])
+        try:
+            for nome in os.listdir(pasta):
+                if nome.startswith(digest):
+                    os.remove(os.path.join(pasta, nome))
+            if not os.listdir(pasta):
+                os.rmdir(pasta)
+        except OSError:
+            pass
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._files, ensure_ascii=False, indent=1, sort_keys=True)
+            self._dirty = False
+        os.makedirs(self.root, exist_ok=True)
+        temp = self.index_path + ".tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(temp, self.index_path)
@@ -0,0 +1,117 @@
+import os
+import struct
+import threading
+
+from libby_core.paths import HISTORY_DIR, key_filename
+
+# Registro fixo: início (epoch), duração (s), código de saída, pico de RSS (bytes, -1 = sem medição)
+RECORD = struct.Struct("<dfiq")
+# Execuções mantidas por programa; o arquivo cresce até o dobro e é compactado
+MAX_RUNS = 500
+
+
+class RunEntry:
+    __slots__ = ('started', 'duration', 'exit_code', 'peak_rss')
+
+    def __init__(self, started, duration, exit_code, peak_rss=None):
+        self.started = started
+        self.duration = duration
+        self.exit_code = exit_code
+        self.peak_rss = peak_rss
+
+    @property
+    def ended(self):
+        return self.started + self.duration
+
+    @property
+    def failed(self):
+        return self.exit_code != 0
+
+
+def percentile(sorted_values, p):
+    """Percentil pelo método do posto mais próximo (valores já ordenados)"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class RunHistory:
+    """Histórico de execuções, um arquivo binário só de acréscimos por programa.
+
+    Cada execução ocupa RECORD.size bytes; a retenção é limitada a MAX_RUNS
+    por programa, regravando o arquivo só quando ele passa do dobro disso.
+    """
+
+    def __init__(self, history_dir=HISTORY_DIR, max_runs=MAX_RUNS):
+        self.history_dir = history_dir
+        self.max_runs = max_runs
+        self._lock = threading.Lock()
+
+    def path_for(self, key):
+        return os.path.join(self.history_dir, key_filename(key) + ".runs")
+
+    def append(self, key, started, duration, exit_code, peak_rss=None):
+        data = RECORD.pack(started, duration, exit_code, -1 if peak_rss is None else int(peak_rss))
+        path = self.path_for(key)
+        with self._lock:
+            os.makedirs(self.history_dir, exist_ok=True)
+            with open(path, "ab") as f:
+                f.write(data)
+                size = f.tell()
+            if size > 2 * self.max_runs * RECORD.size:
+                self._compact(path)
+
+    def _compact(self, path):
+        keep = self.max_runs * RECORD.size
+        with open(path, "rb") as f:
+            f.seek(-keep, os.SEEK_END)
+            data = f.read()
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def runs(self, key, limit=None):
+        """Execuções do programa, da mais antiga para a mais recente"""
+        path = self.path_for(key)
+        with self._lock:
+            try:
+                with open(path, "rb") as f:
+                    if limit:
+                        f.seek(0, os.SEEK_END)
+                        f.seek(max(0, f.tell() - limit * RECORD.size))
+                    data = f.read()
+            except FileNotFoundError:
+                return []
+        data = data[:len(data) - len(data) % RECORD.size]
+        return [RunEntry(started, duration, exit_code, None if peak_rss < 0 else peak_rss)
+                for started, duration, exit_code, peak_rss in RECORD.iter_unpack(data)]
+
+    def delete(self, key):
+        with self._lock:
+            try:
+                os.remove(self.path_for(key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self, key, recent=10):
+        """Resumo das execuções: percentis de duração, falhas e tendência recente"""
+        runs = self.runs(key)
+        if not runs:
+            return None
+        durations = sorted(run.duration for run in runs)
+        recent_durations = sorted(run.duration for run in runs[-recent:])
+        failures = sum(1 for run in runs if run.failed)
+        peaks = [run.peak_rss for run in runs if run.peak_rss is not None]
+        return {
+            'runs': len(runs),
+            'failures': failures,
+            'failure_rate': failures / len(runs),
+            'p50': percentile(durations, 50),
+            'p95': percentile(durations, 95),
+            'p50_recent': percentile(recent_durations, 50),
+            'max_duration': durations[-1],
+            'peak_rss': max(peaks) if peaks else None,
+            'last': runs[-1],
+        }
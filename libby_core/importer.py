@@ -0,0 +1,292 @@
+import fnmatch
+import json
+import os
+import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from libby_core.dedup import ContentStore, StoreResult
+from libby_core.process import CAPTURE_ENV, SUPERVISED_ENV
+from libby_core.scanner import pick_logo
+
+# Arquivos copiados direto para a categoria (soltos na pasta importada)
+DIRECT_EXTS = ('.bat', '.cmd', '.py', '.exe', '.lnk')
+# Pastas processadas em paralelo (cópias e leituras em compartilhamentos de rede)
+IMPORT_WORKERS = 8
+# Níveis de subpastas abaixo da pasta importada (projects/<time>/<bot> = 3)
+IMPORT_DEPTH = 4
+# Pastas nunca percorridas (comparação sem diferenciar maiúsculas)
+IGNORE_GLOBS = ('.git', '.svn', '.hg', '.idea', '.vscode', '.tox', '.venv', 'venv', 'env',
+                '__pycache__', 'node_modules', 'site-packages', 'dist', 'build',
+                'test', 'tests', 'test_*', 'testing')
+# Manifesto opcional na pasta do bot:
+# {"main", "name", "description", "tags", "icon", "ignore", "container"}
+MANIFEST = 'libby.json'
+
+# Regras para achar o arquivo principal sem manifesto, tentadas em ordem:
+# (extensão, exige `if __name__ == "__main__"`). Em cada regra vence o
+# arquivo com nome parecido com o da pasta. A pasta cujos arquivos casam
+# com alguma regra é o bot; só se desce nas que não casam com nenhuma.
+ENTRY_RULES = (
+    ('.py', True),
+    ('.bat', False),
+    ('.cmd', False),
+    ('.exe', False),
+    ('.py', False),
+)
+MAIN_GUARD = re.compile(rb'''if\s+__name__\s*==\s*['"]__main__['"]''')
+GUARD_BYTES = 64 * 1024
+
+
+def ignore_matcher(globs):
+    """Função nome -> bool que diz se a pasta deve ser pulada (um regex só para todos os globs)"""
+    if not globs:
+        return lambda name: False
+    pattern = re.compile("|".join(fnmatch.translate(g.lower()) for g in globs))
+    return lambda name: pattern.match(name.lower()) is not None
+
+
+def _has_main_guard(path):
+    try:
+        with open(path, 'rb') as f:
+            return MAIN_GUARD.search(f.read(GUARD_BYTES)) is not None
+    except OSError:
+        return False
+
+
+def find_main_file(folder_name, files, folder=None, rules=ENTRY_RULES):
+    """Escolhe o arquivo principal da pasta pelas regras (None se nenhuma casar).
+
+    Os nomes são agrupados por extensão numa passada; o conteúdo dos .py só
+    é lido pelas regras que exigem o bloco __main__ (e nunca sem folder).
+    """
+    nome = folder_name.lower().replace('-', '_').replace(' ', '_')
+    por_ext = {}
+    for f in sorted(files):
+        por_ext.setdefault(os.path.splitext(f.lower())[1], []).append(f)
+    for ext, guard in rules:
+        candidatos = por_ext.get(ext)
+        if not candidatos:
+            continue
+        parecidos = [c for c in candidatos if nome in c.lower().replace('-', '_')]
+        ordenados = parecidos + [c for c in candidatos if c not in parecidos]
+        if not guard:
+            return ordenados[0]
+        if folder is None:
+            continue
+        for c in ordenados:
+            if _has_main_guard(os.path.join(folder, c)):
+                return c
+    return None
+
+
+def read_manifest(folder):
+    """Conteúdo do libby.json da pasta; ValueError se não for um objeto JSON válido"""
+    with open(os.path.join(folder, MANIFEST), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if not isinstance(manifest, dict):
+        raise ValueError(f"{MANIFEST} deve ser um objeto JSON")
+    for campo in ('main', 'name', 'description', 'icon'):
+        if campo in manifest and not isinstance(manifest[campo], str):
+            raise ValueError(f"{MANIFEST}: '{campo}' deve ser um texto")
+    for campo in ('ignore', 'container'):
+        if campo in manifest and not isinstance(manifest[campo], bool):
+            raise ValueError(f"{MANIFEST}: '{campo}' deve ser true ou false")
+    tags = manifest.get('tags', [])
+    if not isinstance(tags, list) or not all(isinstance(t, str) for t in tags):
+        raise ValueError(f"{MANIFEST}: 'tags' deve ser uma lista de textos")
+    return manifest
+
+
+def launcher_content(item_path, main_file):
+    """Conteúdo do .bat que abre o programa da subpasta.
+
+    Aberto pelo Libby (LIBBY_SUPERVISED) o programa roda no próprio processo
+    do .bat, para o supervisor ver o fim e medir a duração; com LIBBY_CAPTURE
+    usa python em vez de pythonw para a saída ir para o log. `start` fica só
+    para o duplo clique no Explorer.
+    """
+    if main_file.endswith('.py'):
+        iniciar, supervisionar = f'start "" pythonw {main_file}', f'pythonw {main_file}'
+        capturar = f'python {main_file}'
+    else:
+        iniciar, supervisionar = f'start "" "{main_file}"', f'"{main_file}"'
+        capturar = supervisionar
+    return (f'@echo off\ncd /d "{item_path}"\n'
+            f'if defined {CAPTURE_ENV} goto captura\n'
+            f'if defined {SUPERVISED_ENV} goto supervisionado\n'
+            f'{iniciar}\ngoto :eof\n'
+            f':supervisionado\n{supervisionar}\ngoto :eof\n'
+            f':captura\n{capturar}\n')
+
+
+def _visit(path, partes, categoria_path, hub_dir, descer, ignorar):
+    """Uma listagem da pasta decide se ela é um bot ou se é preciso descer.
+
+    Retorna (key, metadados, subpastas): key do .bat criado quando a pasta
+    é um bot (manifesto ou qualquer ENTRY_RULE); senão as subpastas
+    [(caminho, partes)] a visitar. Com {"container": true} no manifesto a
+    pasta nunca é bot e sempre se desce nela.
+    """
+    arquivos = []
+    pastas = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                if not ignorar(entry.name):
+                    pastas.append((entry.path, partes + (entry.name,)))
+            else:
+                arquivos.append(entry.name)
+
+    manifest = read_manifest(path) if MANIFEST in arquivos else {}
+    if manifest.get('ignore'):
+        return None, None, ()
+    if manifest.get('container'):
+        return None, None, (pastas if descer else ())
+    main_file = manifest.get('main')
+    if main_file and not os.path.isfile(os.path.join(path, main_file)):
+        raise ValueError(f"{MANIFEST}: arquivo principal não encontrado: {main_file}")
+    main_file = main_file or find_main_file(partes[-1], arquivos, path)
+    if not main_file:
+        return None, None, (pastas if descer else ())
+    key, dados = _write_bot(path, partes, main_file, manifest, arquivos, categoria_path, hub_dir)
+    return key, dados, ()
+
+
+def _write_bot(path, partes, main_file, manifest, arquivos, categoria_path, hub_dir):
+    """Cria o .bat lançador do bot; (key, metadados do manifesto e logo)"""
+    # Bots aninhados levam o caminho no nome para não colidir ("time - bot.bat")
+    bat_path = os.path.join(categoria_path, " - ".join(partes) + ".bat")
+    with open(bat_path, 'w') as f:
+        f.write(launcher_content(path, main_file))
+
+    dados = {}
+    if manifest.get('name'):
+        dados['display_name'] = manifest['name']
+    if manifest.get('description'):
+        dados['description'] = manifest['description']
+    if manifest.get('tags'):
+        dados['tags'] = list(manifest['tags'])
+    if manifest.get('icon'):
+        logo_path = os.path.normpath(os.path.join(path, manifest['icon']))
+    else:
+        logo_path = pick_logo((n, os.path.join(path, n)) for n in arquivos)
+    if logo_path:
+        dados['icon'] = logo_path
+    return os.path.relpath(bat_path, hub_dir), dados
+
+
+def _import_file(item_path, destino, store):
+    """Coloca um executável solto no Hub pelo ContentStore; None se já existia"""
+    if os.path.exists(destino):
+        return None
+    return store.add(item_path, destino)
+
+
+def import_folder(pasta, hub_dir, categoria, workers=IMPORT_WORKERS, cancel=None, progress=None,
+                  depth=IMPORT_DEPTH, ignore=IGNORE_GLOBS, store=None):
+    """Importa os programas de uma pasta externa (e das subpastas) para a categoria do Hub.
+
+    Cada pasta até depth níveis abaixo vira um bot se tiver libby.json com
+    "main" ou um arquivo que case com as ENTRY_RULES; senão (ou com
+    "container" no manifesto) o Libby desce nela. Pastas que casam com
+    ignore são podadas sem serem listadas.
+    Executáveis soltos na raiz entram pelo ContentStore (conteúdo repetido
+    vira hardlink em vez de cópia). As pastas são visitadas num pool
+    de threads; progress(feitos, total) é chamado a cada item (o total cresce
+    conforme a árvore é descoberta) e cancel (threading.Event) para antes dos
+    itens que ainda não começaram.
+    Retorna (importados, {key: metadados novos}, [(item, erro)],
+    [(key, keys com o mesmo conteúdo)]) do que foi concluído; um item com
+    erro não interrompe os demais.
+    """
+    categoria_path = os.path.join(hub_dir, categoria)
+    os.makedirs(categoria_path, exist_ok=True)
+    cancel = cancel or threading.Event()
+    ignorar = ignore_matcher(ignore)
+    store = store or ContentStore(hub_dir)
+
+    pastas = []
+    soltos = []
+    with os.scandir(pasta) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                if not ignorar(entry.name):
+                    pastas.append((entry.path, (entry.name,)))
+            elif entry.name.lower().endswith(DIRECT_EXTS):
+                soltos.append((entry.name, entry.path))
+
+    importados = 0
+    metadados = {}
+    falhas = []
+    duplicados = []
+    lancadores = set()
+    feitos = 0
+    total = len(pastas) + len(soltos)
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="libby-import") as pool:
+        pendentes = {}
+
+        def visitar(path, partes):
+            future = pool.submit(_visit, path, partes, categoria_path, hub_dir, len(partes) < depth, ignorar)
+            pendentes[future] = partes
+
+        def registrar(key, dados):
+            nonlocal importados
+            importados += 1
+            lancadores.add(os.path.basename(key).lower())
+            if dados:
+                metadados[key] = dados
+
+        def coletar():
+            nonlocal feitos, total
+            done, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+            for future in done:
+                partes = pendentes.pop(future)
+                if future.cancelled():
+                    continue
+                feitos += 1
+                try:
+                    resultado = future.result()
+                except (OSError, ValueError) as e:
+                    falhas.append((os.path.join(*partes), str(e)))
+                    continue
+                if resultado is None:
+                    continue
+                if isinstance(resultado, StoreResult):
+                    key = os.path.relpath(resultado.path, hub_dir)
+                    registrar(key, None)
+                    if resultado.duplicates:
+                        duplicados.append((key, resultado.duplicates))
+                    continue
+                key, dados, subpastas = resultado
+                if key is not None:
+                    registrar(key, dados)
+                if not cancel.is_set():
+                    for path, sub in subpastas:
+                        total += 1
+                        visitar(path, sub)
+                if progress:
+                    progress(feitos, total)
+
+        if progress:
+            progress(0, total)
+        for path, partes in pastas:
+            visitar(path, partes)
+        while pendentes:
+            coletar()
+            if cancel.is_set():
+                for future in pendentes:
+                    future.cancel()
+
+        # Soltos por último: um .bat de subpasta com o mesmo nome tem prioridade
+        for nome, path in soltos:
+            if cancel.is_set():
+                break
+            if nome.lower() not in lancadores:
+                pendentes[pool.submit(_import_file, path, os.path.join(categoria_path, nome), store)] = (nome,)
+            else:
+                feitos += 1
+        while pendentes:
+            coletar()
+    store.save()
+    return importados, metadados, falhas, duplicados
@@ -0,0 +1,105 @@
+import os
+import threading
+from datetime import datetime
+
+from libby_core.paths import LOGS_DIR, key_filename
+
+# Tamanho máximo de cada arquivo e quantos arquivos antigos manter (.1, .2, ...)
+MAX_BYTES = 1024 * 1024
+BACKUPS = 3
+
+_open_logs = {}  # caminho -> [RotatingLog, referências]
+_open_lock = threading.Lock()
+
+
+def log_path_for(key, logs_dir=LOGS_DIR):
+    """Arquivo de log do programa (categoria e nome viram parte do nome do arquivo)"""
+    return os.path.join(logs_dir, key_filename(key) + ".log")
+
+
+class RotatingLog:
+    """Arquivo de log com tamanho limitado; ao encher, roda para .1, .2, ...
+
+    Seguro para várias threads: duas instâncias do mesmo programa
+    escrevem no mesmo arquivo sem misturar pedaços.
+    """
+
+    def __init__(self, path, max_bytes=MAX_BYTES, backups=BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(path, "ab")
+        self._size = self._file.tell()
+
+    def _rotate(self):
+        self._file.close()
+        for i in range(self.backups - 1, 0, -1):
+            origem = f"{self.path}.{i}"
+            if os.path.exists(origem):
+                os.replace(origem, f"{self.path}.{i + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "ab")
+        self._size = 0
+
+    def write(self, data):
+        with self._lock:
+            while data:
+                if self._size >= self.max_bytes:
+                    self._rotate()
+                parte = data[:self.max_bytes - self._size]
+                data = data[len(parte):]
+                self._file.write(parte)
+                self._size += len(parte)
+            self._file.flush()
+
+    def mark(self, texto):
+        """Linha de marcação (início/fim de execução) com data e hora"""
+        agora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.write(f"\n=== {agora} {texto} ===\n".encode("utf-8"))
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def acquire(path):
+    """Abre (ou reaproveita) o log do caminho; cada acquire pede um release"""
+    with _open_lock:
+        entry = _open_logs.get(path)
+        if entry is None:
+            entry = _open_logs[path] = [RotatingLog(path), 0]
+        entry[1] += 1
+        return entry[0]
+
+
+def release(log):
+    with _open_lock:
+        entry = _open_logs.get(log.path)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del _open_logs[log.path]
+            log.close()
+
+
+def pump(stream, log, describe_exit=None):
+    """Copia a saída do processo para o log em blocos, sem acumular em memória"""
+    try:
+        while True:
+            chunk = stream.read1(65536)
+            if not chunk:
+                break
+            log.write(chunk)
+    except (OSError, ValueError):
+        pass
+    finally:
+        stream.close()
+        if describe_exit:
+            log.mark(describe_exit())
+        release(log)
@@ -0,0 +1,16 @@
+import os
+import re
+
+# Caminho da pasta de config no AppData
+APPDATA_DIR = os.path.join(os.environ.get("APPDATA", os.path.expanduser("~")), "MeuHub")
+CONFIG_FILE = os.path.join(APPDATA_DIR, "config.json")
+DATABASE_FILE = os.path.join(APPDATA_DIR, "libby.db")
+CACHE_DIR = os.path.join(APPDATA_DIR, "icon_cache")
+LOGS_DIR = os.path.join(APPDATA_DIR, "logs")
+HISTORY_DIR = os.path.join(APPDATA_DIR, "history")
+SNAPSHOT_FILE = os.path.join(APPDATA_DIR, "hub_snapshot.bin")
+
+
+def key_filename(key):
+    """Nome de arquivo seguro para a key do programa ("Categoria/bot.bat" -> "Categoria__bot.bat")"""
+    return re.sub(r'[^\w.-]+', '_', key.replace(os.sep, "__").replace("/", "__"))
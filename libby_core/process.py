@@ -0,0 +1,167 @@
+import os
+import re
+import time
+import threading
+import subprocess
+from datetime import datetime
+
+from libby_core import logs
+
+# Variável presente em todo programa aberto pelo supervisor: o .bat gerado na
+# importação roda o programa no próprio processo em vez de usar `start`, senão
+# o supervisor veria só o .bat terminando na hora
+SUPERVISED_ENV = "LIBBY_SUPERVISED"
+# Além dela, com captura de saída ligada (o .bat usa python em vez de pythonw)
+CAPTURE_ENV = "LIBBY_CAPTURE"
+# Linha de .bat que solta o programa e termina (`start` sem /wait)
+DETACH_LINE = re.compile(rb'^[ \t@]*start(?![^\r\n]*/wait)\b', re.IGNORECASE | re.MULTILINE)
+SCRIPT_BYTES = 64 * 1024
+
+
+class RunRecord:
+    """Uma execução de programa acompanhada pelo supervisor"""
+    __slots__ = ('key', 'path', 'popen', 'pid', 'started_at', 'ended_at',
+                 '_started', 'duration', 'exit_code', 'log_path', 'peak_rss', 'tracked')
+
+    def __init__(self, key, path, popen, log_path=None, tracked=True):
+        self.key = key
+        self.path = path
+        self.popen = popen
+        self.log_path = log_path
+        # False: o processo acompanhado só solta o programa (duração e código não são dele)
+        self.tracked = tracked
+        self.pid = popen.pid
+        self.started_at = datetime.now()
+        self.ended_at = None
+        self._started = time.monotonic()
+        self.duration = None
+        self.exit_code = None
+        self.peak_rss = None  # bytes, quando há medição de recursos
+
+    @property
+    def running(self):
+        return self.exit_code is None
+
+
+def build_command(path):
+    """Argumentos do Popen para o programa.
+
+    Executáveis rodam direto (o PID é o do próprio programa); scripts e
+    atalhos continuam passando pelo shell, como antes.
+    """
+    if path.lower().endswith(".exe"):
+        return [path], False
+    return path, True
+
+
+def is_detached(path):
+    """True se o programa volta na hora e deixa o verdadeiro rodando solto.
+
+    Atalhos .lnk são abertos pelo shell; .bat/.cmd com `start` (como os
+    lançadores gerados antes de LIBBY_SUPERVISED) também, a menos que
+    tratem a variável.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".lnk":
+        return True
+    if ext not in (".bat", ".cmd"):
+        return False
+    try:
+        with open(path, "rb") as f:
+            conteudo = f.read(SCRIPT_BYTES)
+    except OSError:
+        return False
+    return SUPERVISED_ENV.encode() not in conteudo and DETACH_LINE.search(conteudo) is not None
+
+
+class ProcessSupervisor:
+    """Guarda os handles dos processos lançados e avisa quando eles terminam.
+
+    Uma única thread faz o poll de todos os processos vivos; ela só existe
+    enquanto houver algo rodando. on_exit é chamado nessa thread.
+    """
+
+    def __init__(self, on_exit=None, poll_interval=0.5):
+        self.on_exit = on_exit
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._records = []
+        self._thread = None
+        self._stop = threading.Event()
+
+    def launch(self, key, path, log_path=None, **popen_kwargs):
+        """Inicia o programa e passa a acompanhá-lo; retorna o RunRecord.
+
+        Com log_path, stdout e stderr vão para um log rotativo, copiados por
+        uma thread própria do processo.
+        """
+        command, shell = build_command(path)
+        env = dict(popen_kwargs.pop('env', None) or os.environ)
+        env[SUPERVISED_ENV] = "1"
+        popen_kwargs['env'] = env
+        log = None
+        if log_path:
+            log = logs.acquire(log_path)
+            # Bots Python escrevem sem buffer e em UTF-8
+            env.update({"PYTHONUNBUFFERED": "1", "PYTHONIOENCODING": "utf-8", CAPTURE_ENV: "1"})
+            popen_kwargs.update(
+                stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                creationflags=popen_kwargs.get('creationflags', 0) | getattr(subprocess, "CREATE_NO_WINDOW", 0)
+            )
+        try:
+            popen = subprocess.Popen(command, shell=shell, **popen_kwargs)
+        except Exception:
+            if log:
+                logs.release(log)
+            raise
+        record = RunRecord(key, path, popen, log_path, tracked=not is_detached(path))
+        if log:
+            log.mark(f"início: {os.path.basename(path)} (pid {popen.pid})")
+            threading.Thread(
+                target=logs.pump, name=f"libby-log-{popen.pid}", daemon=True,
+                args=(popen.stdout, log, lambda: f"fim: código {popen.wait()}")
+            ).start()
+        with self._lock:
+            self._records.append(record)
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="libby-supervisor", daemon=True)
+                self._thread.start()
+        return record
+
+    def running(self, key=None):
+        with self._lock:
+            return [r for r in self._records if key is None or r.key == key]
+
+    def running_count(self, key=None):
+        return len(self.running(key))
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            with self._lock:
+                records = list(self._records)
+            finished = []
+            for record in records:
+                exit_code = record.popen.poll()
+                if exit_code is not None:
+                    record.exit_code = exit_code
+                    record.ended_at = datetime.now()
+                    record.duration = time.monotonic() - record._started
+                    finished.append(record)
+            with self._lock:
+                for record in finished:
+                    self._records.remove(record)
+                if not self._records:
+                    self._thread = None
+                    done = True
+                else:
+                    done = False
+            for record in finished:
+                if self.on_exit:
+                    self.on_exit(record)
+            if done:
+                return
+
+    def stop(self):
+        """Para o acompanhamento (os processos continuam rodando)"""
+        self._stop.set()
@@ -0,0 +1,173 @@
+import os
+import time
+import threading
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+class ProcBackend:
+    """Linux: uma única passada por /proc/<pid>/stat lê pai, CPU e RSS de todos"""
+
+    def __init__(self):
+        self.clk_tck = os.sysconf("SC_CLK_TCK")
+        self.page_size = os.sysconf("SC_PAGE_SIZE")
+        self._usage = {}
+
+    @staticmethod
+    def available():
+        return os.path.exists("/proc/self/stat")
+
+    def parents(self):
+        """pid -> ppid; guarda CPU/RSS da mesma leitura para usage()"""
+        parents = {}
+        usage = {}
+        clk_tck = self.clk_tck
+        page_size = self.page_size
+        for name in os.listdir("/proc"):
+            if not name.isdigit():
+                continue
+            try:
+                fd = os.open(f"/proc/{name}/stat", os.O_RDONLY)
+                try:
+                    data = os.read(fd, 1024)
+                finally:
+                    os.close(fd)
+            except OSError:
+                continue
+            # O nome do processo (entre parênteses) pode ter espaços
+            fields = data[data.rfind(b")") + 2:].split()
+            pid = int(name)
+            parents[pid] = int(fields[1])
+            usage[pid] = ((int(fields[11]) + int(fields[12])) / clk_tck, int(fields[21]) * page_size)
+        self._usage = usage
+        return parents
+
+    def usage(self, pid):
+        """(segundos de CPU, RSS em bytes) ou None se o processo sumiu"""
+        return self._usage.get(pid)
+
+
+class PsutilBackend:
+    """Windows/macOS: psutil, lendo CPU/RSS só dos processos das árvores acompanhadas"""
+
+    def __init__(self):
+        self._procs = {}
+
+    @staticmethod
+    def available():
+        return psutil is not None
+
+    def parents(self):
+        parents = {}
+        procs = {}
+        for proc in psutil.process_iter(['ppid']):
+            parents[proc.pid] = proc.info['ppid']
+            procs[proc.pid] = proc
+        self._procs = procs
+        return parents
+
+    def usage(self, pid):
+        proc = self._procs.get(pid)
+        if proc is None:
+            return None
+        try:
+            with proc.oneshot():
+                times = proc.cpu_times()
+                return times.user + times.system, proc.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+
+
+def make_backend():
+    """psutil quando instalado; senão /proc; None quando nenhum está disponível"""
+    for backend in (PsutilBackend, ProcBackend):
+        if backend.available():
+            return backend()
+    return None
+
+
+class ResourceSampler:
+    """Thread que mede CPU e memória dos processos acompanhados e dos filhos deles.
+
+    A cada intervalo faz uma leitura só da tabela de processos, soma o uso de
+    cada árvore e chama on_sample([(record, cpu_percent, rss)]) na thread do
+    sampler. O pico de RSS de cada execução fica em record.peak_rss.
+    """
+
+    def __init__(self, supervisor, interval=2.0, on_sample=None, backend=None):
+        self.supervisor = supervisor
+        self.interval = interval
+        self.on_sample = on_sample
+        self.backend = backend if backend is not None else make_backend()
+        self._prev = {}  # RunRecord -> (instante, segundos de CPU)
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def available(self):
+        return self.backend is not None
+
+    def start(self):
+        if not self.available or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="libby-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                samples = self.sample_once()
+            except Exception:
+                continue
+            if samples and self.on_sample:
+                self.on_sample(samples)
+
+    def sample_once(self):
+        records = self.supervisor.running()
+        if not records:
+            self._prev.clear()
+            return []
+
+        parents = self.backend.parents()
+        children = {}
+        for pid, ppid in parents.items():
+            children.setdefault(ppid, []).append(pid)
+
+        now = time.monotonic()
+        usage = self.backend.usage
+        samples = []
+        prev = {}
+        for record in records:
+            cpu = 0.0
+            rss = 0
+            seen = set()
+            stack = [record.pid]
+            while stack:
+                pid = stack.pop()
+                if pid in seen:
+                    continue
+                seen.add(pid)
+                info = usage(pid)
+                if info is None:
+                    continue
+                cpu += info[0]
+                rss += info[1]
+                stack.extend(children.get(pid, ()))
+
+            last = self._prev.get(record)
+            percent = 0.0
+            if last and now > last[0]:
+                # Filhos que terminaram levam o tempo de CPU junto: não deixa ficar negativo
+                percent = max(0.0, (cpu - last[1]) / (now - last[0]) * 100)
+            prev[record] = (now, cpu)
+            if rss > (record.peak_rss or 0):
+                record.peak_rss = rss
+            samples.append((record, percent, rss))
+        self._prev = prev
+        return samples
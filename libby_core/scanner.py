@@ -0,0 +1,187 @@
+import os
+from collections import namedtuple
+
+# Extensões reconhecidas como programas dentro das categorias
+PROGRAM_EXTS = (".exe", ".lnk", ".bat", ".cmd", ".py")
+
+# Logos detectados automaticamente, em ordem de prioridade
+LOGO_NAMES = ['logo', 'icon', 'icone', 'favicon', 'app']
+LOGO_EXTS = ['.png', '.ico', '.jpg', '.jpeg', '.bmp']
+
+# programs: lista ordenada de (arquivo, mtime)
+CategoryScan = namedtuple("CategoryScan", "name mtime programs")
+
+
+def pick_logo(entries):
+    """Escolhe o logo entre (nome, caminho) de uma pasta, ou None.
+
+    Prioridade: nome em LOGO_NAMES, depois extensão; qualquer .ico serve
+    como último recurso (o primeiro em ordem alfabética).
+    """
+    melhor = None
+    melhor_rank = None
+    primeiro_ico = None
+    for name, path in entries:
+        base, ext = os.path.splitext(name.lower())
+        if ext not in LOGO_EXTS:
+            continue
+        if base in LOGO_NAMES:
+            rank = (LOGO_NAMES.index(base), LOGO_EXTS.index(ext))
+            if melhor_rank is None or rank < melhor_rank:
+                melhor, melhor_rank = path, rank
+        elif ext == '.ico' and (primeiro_ico is None or name < primeiro_ico[0]):
+            primeiro_ico = (name, path)
+    return melhor or (primeiro_ico[1] if primeiro_ico else None)
+
+
+class HubSnapshot:
+    """Resultado compacto e ordenado de uma varredura do Hub"""
+    __slots__ = ('categories', 'total_programs')
+
+    def __init__(self, categories):
+        self.categories = categories
+        self.total_programs = sum(len(c.programs) for c in categories)
+
+    def category_names(self):
+        return [c.name for c in self.categories]
+
+    def keys(self):
+        for categoria in self.categories:
+            for arquivo, _ in categoria.programs:
+                yield os.path.join(categoria.name, arquivo)
+
+
+class HubScanner:
+    """Varre a pasta Hub com os.scandir numa única passada.
+
+    Reaproveita DirEntry.is_dir() e DirEntry.stat(), que no Windows vêm da
+    própria listagem e não custam uma ida extra ao disco (ou à rede).
+    """
+
+    def __init__(self, hub_dir):
+        self.hub_dir = hub_dir
+        self.generation = 0
+        self._dir_mtimes = {}
+        self._logo_cache = {}  # pasta -> (mtime, logo encontrado, geração)
+
+    def list_categories(self):
+        """[(categoria, mtime_ns)] das subpastas do Hub, em ordem alfabética.
+
+        Pastas começando com ponto (ex.: .libby_store) não são categorias.
+        """
+        categorias = []
+        with os.scandir(self.hub_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                try:
+                    if entry.is_dir():
+                        categorias.append((entry.name, entry.stat().st_mtime_ns))
+                except OSError:
+                    continue
+        categorias.sort()
+        return categorias
+
+    def scan(self, categories=None):
+        """Varre o Hub inteiro ou só as categorias informadas.
+
+        categories: None para o Hub inteiro, ou lista de (nome, mtime_ns) /
+        nomes de categorias a reler.
+        """
+        self.generation += 1
+        if categories is None:
+            categories = self.list_categories()
+        resultado = []
+        for categoria in categories:
+            if isinstance(categoria, str):
+                resultado.append(self.scan_category(categoria))
+            else:
+                resultado.append(self.scan_category(*categoria))
+        resultado.sort()
+        return HubSnapshot(resultado)
+
+    def revalidate(self, previous):
+        """Confere um snapshot anterior pelos mtimes das pastas.
+
+        Só as categorias novas ou com mtime diferente são relidas; as demais
+        vêm do snapshot anterior sem listar a pasta.
+        """
+        self.generation += 1
+        anteriores = {c.name: c for c in previous.categories}
+        resultado = []
+        for name, mtime in self.list_categories():
+            anterior = anteriores.get(name)
+            if anterior is not None and anterior.mtime == mtime:
+                self._dir_mtimes[os.path.join(self.hub_dir, name)] = mtime
+                resultado.append(anterior)
+            else:
+                resultado.append(self.scan_category(name, mtime))
+        return HubSnapshot(resultado)
+
+    def restore(self, snapshot, logos):
+        """Prepara o scanner com um snapshot salvo, sem ir ao disco.
+
+        logos: {pasta: (mtime, logo)} como devolvido por logos(); valem como
+        memorizados nesta geração até a próxima varredura conferir os mtimes.
+        """
+        for categoria in snapshot.categories:
+            if categoria.mtime is not None:
+                self._dir_mtimes[os.path.join(self.hub_dir, categoria.name)] = categoria.mtime
+        for folder, (mtime, logo) in logos.items():
+            self._logo_cache[folder] = (mtime, logo, self.generation)
+
+    def category_mtime(self, name):
+        return self._dir_mtimes.get(os.path.join(self.hub_dir, name))
+
+    def logos(self):
+        """{pasta: (mtime, logo)} já encontrados, para persistir com o snapshot"""
+        return {folder: (mtime, logo) for folder, (mtime, logo, _) in self._logo_cache.items()}
+
+    def scan_category(self, name, mtime=None):
+        path = os.path.join(self.hub_dir, name)
+        programas = []
+        try:
+            if mtime is None:
+                mtime = os.stat(path).st_mtime_ns
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if not entry.name.lower().endswith(PROGRAM_EXTS):
+                        continue
+                    try:
+                        programas.append((entry.name, entry.stat().st_mtime))
+                    except OSError:
+                        continue
+        except OSError:
+            # Pasta removida entre a listagem e a varredura
+            return CategoryScan(name, None, [])
+        programas.sort()
+        self._dir_mtimes[path] = mtime
+        return CategoryScan(name, mtime, programas)
+
+    def find_logo(self, folder):
+        """Procura arquivo de logo em uma pasta.
+
+        Faz uma única leitura da pasta e memoriza o resultado por (pasta, mtime);
+        dentro da mesma varredura nem o mtime é consultado de novo.
+        """
+        cached = self._logo_cache.get(folder)
+        if cached and cached[2] == self.generation:
+            return cached[1]
+        mtime = self._dir_mtimes.get(folder)
+        if mtime is None:
+            try:
+                mtime = os.stat(folder).st_mtime_ns
+            except OSError:
+                return None
+        if cached and cached[0] == mtime:
+            self._logo_cache[folder] = (mtime, cached[1], self.generation)
+            return cached[1]
+
+        try:
+            with os.scandir(folder) as entries:
+                resultado = pick_logo((entry.name, entry.path) for entry in entries)
+        except OSError:
+            return None
+
+        self._logo_cache[folder] = (mtime, resultado, self.generation)
+        return resultado
@@ -0,0 +1,210 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+DEFAULT_LIMITS = {
+    "max_running": 4,   # 0 = sem limite
+    "per_category": {},  # categoria -> máximo simultâneo
+    "per_tag": {},       # tag -> máximo simultâneo (ex.: {"producao": 1})
+    "interval": 0.0,     # segundos mínimos entre dois lançamentos
+}
+
+
+class LaunchJob:
+    """Pedido de execução aguardando vaga (ou já lançado)"""
+    __slots__ = ('key', 'path', 'category', 'tags', 'priority', 'seq', 'queued_at', 'record', 'batch',
+                 'options')
+
+    def __init__(self, key, path, category, tags, priority, seq, batch=None, options=None):
+        self.key = key
+        self.path = path
+        self.category = category
+        self.tags = [tag.lower() for tag in tags]
+        self.priority = priority
+        self.seq = seq
+        self.queued_at = time.time()
+        self.record = None
+        self.batch = batch  # identifica jobs enviados juntos (None = lançamento avulso)
+        self.options = options or {}  # repassadas ao supervisor.launch (ex.: log_path)
+
+    def __lt__(self, other):
+        # Maior prioridade primeiro; empate segue a ordem de chegada
+        return (-self.priority, self.seq) < (-other.priority, other.seq)
+
+
+class LaunchScheduler:
+    """Fila de lançamentos com limite global, por categoria e por tag.
+
+    Não tem thread própria: quem usa chama submit(), finished() quando o
+    supervisor avisa que um processo terminou e drain() quando wait_time()
+    indicar que o intervalo mínimo passou. Com um executor, os Popen rodam
+    no pool (a vaga fica reservada enquanto isso) e on_start(job) /
+    on_error(job, exc) são chamados na thread do pool; sem executor, na
+    thread que fez a chamada.
+    """
+
+    def __init__(self, supervisor, limits=None, on_start=None, on_error=None, executor=None):
+        self.supervisor = supervisor
+        self.on_start = on_start
+        self.on_error = on_error
+        self.executor = executor
+        self._lock = threading.RLock()
+        self._queue = []
+        self._starting = set()  # jobs sendo lançados no pool
+        self._active = {}  # RunRecord -> job
+        self._ended = set()  # processos que terminaram antes de serem registrados
+        self._seq = itertools.count()
+        self._last_start = 0.0
+        self.configure(limits)
+
+    def configure(self, limits=None):
+        limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.max_running = int(limits["max_running"] or 0)
+        self.category_limits = {k: int(v) for k, v in limits["per_category"].items()}
+        self.tag_limits = {k.lower(): int(v) for k, v in limits["per_tag"].items()}
+        self.interval = float(limits["interval"] or 0)
+
+    def submit(self, key, path, category="", tags=(), priority=0, **options):
+        """Enfileira o programa e já lança o que couber"""
+        with self._lock:
+            job = LaunchJob(key, path, category, tags, priority, next(self._seq), options=options)
+            heapq.heappush(self._queue, job)
+        self.drain()
+        return job
+
+    def submit_batch(self, entries, priority=0):
+        """Enfileira vários (key, path, category, tags, options) de uma vez, com um único drain"""
+        with self._lock:
+            batch = next(self._seq)
+            jobs = [LaunchJob(key, path, category, tags, priority, next(self._seq), batch, options)
+                    for key, path, category, tags, options in entries]
+            for job in jobs:
+                heapq.heappush(self._queue, job)
+        self.drain()
+        return jobs
+
+    def queued(self):
+        """Jobs aguardando, na ordem em que serão lançados"""
+        with self._lock:
+            return sorted(self._queue)
+
+    def is_queued(self, job):
+        with self._lock:
+            return job in self._queue
+
+    def queued_count(self, key=None):
+        with self._lock:
+            if key is None:
+                return len(self._queue)
+            return sum(1 for job in self._queue if job.key == key)
+
+    def active(self):
+        with self._lock:
+            return list(self._active.values())
+
+    def cancel(self, job):
+        """Tira o job da fila; False se ele já foi lançado"""
+        with self._lock:
+            try:
+                self._queue.remove(job)
+            except ValueError:
+                return False
+            heapq.heapify(self._queue)
+            return True
+
+    def cancel_all(self):
+        with self._lock:
+            jobs, self._queue = self._queue, []
+            return jobs
+
+    def finished(self, record):
+        """Libera a vaga de um processo que terminou e lança os próximos"""
+        with self._lock:
+            job = self._active.pop(record, None)
+            if job is None:
+                self._ended.add(record)
+        self.drain()
+        return job
+
+    def wait_time(self):
+        """Segundos até o intervalo mínimo permitir o próximo lançamento"""
+        with self._lock:
+            if not self._queue or not self.interval:
+                return 0.0
+            return max(0.0, self._last_start + self.interval - time.monotonic())
+
+    def _allowed(self, job, running, by_category, by_tag):
+        if self.max_running and running >= self.max_running:
+            return False
+        limit = self.category_limits.get(job.category)
+        if limit and by_category.get(job.category, 0) >= limit:
+            return False
+        for tag in job.tags:
+            limit = self.tag_limits.get(tag)
+            if limit and by_tag.get(tag, 0) >= limit:
+                return False
+        return True
+
+    def drain(self):
+        """Lança os jobs da fila que cabem nos limites; retorna os despachados"""
+        with self._lock:
+            occupying = list(self._active.values()) + list(self._starting)
+            running = len(occupying)
+            by_category = {}
+            by_tag = {}
+            for job in occupying:
+                by_category[job.category] = by_category.get(job.category, 0) + 1
+                for tag in job.tags:
+                    by_tag[tag] = by_tag.get(tag, 0) + 1
+
+            dispatched = []
+            blocked = []
+            while self._queue:
+                if self.max_running and running >= self.max_running:
+                    break
+                if self.interval and time.monotonic() - self._last_start < self.interval:
+                    break
+                job = heapq.heappop(self._queue)
+                # Job barrado por limite de categoria/tag não segura os demais
+                if not self._allowed(job, running, by_category, by_tag):
+                    blocked.append(job)
+                    continue
+                self._starting.add(job)
+                self._last_start = time.monotonic()
+                running += 1
+                by_category[job.category] = by_category.get(job.category, 0) + 1
+                for tag in job.tags:
+                    by_tag[tag] = by_tag.get(tag, 0) + 1
+                dispatched.append(job)
+
+            for job in blocked:
+                heapq.heappush(self._queue, job)
+
+        for job in dispatched:
+            if self.executor is not None:
+                self.executor.submit(self._spawn, job)
+            else:
+                self._spawn(job)
+        return dispatched
+
+    def _spawn(self, job):
+        try:
+            record = self.supervisor.launch(job.key, job.path, **job.options)
+        except Exception as e:
+            with self._lock:
+                self._starting.discard(job)
+            if self.on_error:
+                self.on_error(job, e)
+            self.drain()
+            return
+        with self._lock:
+            self._starting.discard(job)
+            job.record = record
+            if record in self._ended:
+                self._ended.discard(record)
+            else:
+                self._active[record] = job
+        if self.on_start:
+            self.on_start(job)
@@ -0,0 +1,224 @@
+import math
+import threading
+import unicodedata
+from collections import defaultdict
+
+
+def normalize(text):
+    """Minúsculas e sem acentos, para comparar 'Produção' com 'producao'"""
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def word_trigrams(text):
+    """Trigramas de cada palavra com dois espaços antes e um depois ("  b", " bo"...):
+    o começo e o fim da palavra contam, então erros no meio ainda deixam pares em comum"""
+    grams = set()
+    for word in text.split():
+        grams |= trigrams(f"  {word} ")
+    return grams
+
+
+class SearchIndex:
+    """Índice de trigramas e prefixos sobre nome, descrição, tags e arquivo.
+
+    Cada termo da busca precisa aparecer em algum campo (substring; termos de
+    1 ou 2 letras só no começo de uma palavra); quando
+    nada casa exatamente, cai para uma busca aproximada pela proporção de
+    trigramas (das palavras com espaços nas pontas) em comum, exigindo ao
+    menos FUZZY_MIN_GRAMS. O resultado vem ranqueado pelo campo onde casou.
+    Pode ser consultado de outra thread enquanto a interface o atualiza.
+    """
+
+    # Proporção mínima de trigramas em comum na busca aproximada
+    FUZZY_THRESHOLD = 0.3
+    # ... e nunca menos que isto: um trigrama só casa com qualquer coisa
+    FUZZY_MIN_GRAMS = 2
+    # Pontuação máxima da busca aproximada (as exatas começam em 15)
+    FUZZY_MAX_SCORE = 10
+
+    def __init__(self):
+        self._docs = {}  # key -> (nome, tags, arquivo, descrição) normalizados
+        self._grams = {}  # key -> trigramas/prefixos indexados do documento
+        self._trigrams = defaultdict(set)
+        self._prefixes = defaultdict(set)  # prefixos de 1 e 2 letras das palavras
+        self._version = 0
+        self._last = None  # (versão, consulta, candidatos) para refinar enquanto digita
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def clear(self):
+        with self._lock:
+            self._docs.clear()
+            self._grams.clear()
+            self._trigrams.clear()
+            self._prefixes.clear()
+            self._version += 1
+
+    def update(self, key, display_name, description="", tags=(), filename=""):
+        """Indexa (ou reindexa) um programa; custo proporcional ao tamanho dele"""
+        with self._lock:
+            doc = (normalize(display_name), normalize(" ".join(tags)),
+                   normalize(filename), normalize(description))
+            if self._docs.get(key) == doc:
+                return
+            self.remove(key)
+            self._docs[key] = doc
+            self._version += 1
+
+            grams = set()
+            prefixes = set()
+            for field in doc:
+                grams |= word_trigrams(field)
+                for word in field.split():
+                    prefixes.add(word[:1])
+                    prefixes.add(word[:2])
+            for gram in grams:
+                self._trigrams[gram].add(key)
+            for prefix in prefixes:
+                self._prefixes[prefix].add(key)
+            self._grams[key] = (grams, prefixes)
+
+    def remove(self, key):
+        with self._lock:
+            if self._docs.pop(key, None) is None:
+                return
+            self._version += 1
+            grams, prefixes = self._grams.pop(key)
+            for gram in grams:
+                bucket = self._trigrams[gram]
+                bucket.discard(key)
+                if not bucket:
+                    del self._trigrams[gram]
+            for prefix in prefixes:
+                bucket = self._prefixes[prefix]
+                bucket.discard(key)
+                if not bucket:
+                    del self._prefixes[prefix]
+
+    def _candidates(self, term):
+        """Documentos que podem conter o termo como substring"""
+        if len(term) < 3:
+            return self._prefixes.get(term, set()) if term else set(self._docs)
+        postings = sorted((self._trigrams.get(g, ()) for g in trigrams(term)), key=len)
+        if not postings or not postings[0]:
+            return set()
+        return set(postings[0]).intersection(*postings[1:])
+
+    @staticmethod
+    def _contains(field, term):
+        """Regra de casamento: substring, ou começo de palavra para termos curtos (como o índice)"""
+        if len(term) >= 3:
+            return term in field
+        return any(word.startswith(term) for word in field.split())
+
+    @classmethod
+    def _score_term(cls, doc, term):
+        nome, tags, arquivo, descricao = doc
+        if nome == term:
+            return 100
+        if nome.startswith(term):
+            return 80
+        if (" " + term) in nome:
+            return 60
+        if cls._contains(nome, term):
+            return 45
+        if cls._contains(tags, term):
+            return 35
+        if cls._contains(arquivo, term):
+            return 25
+        if cls._contains(descricao, term):
+            return 15
+        return 0
+
+    def _score(self, doc, terms):
+        total = 0
+        for term in terms:
+            score = self._score_term(doc, term)
+            if not score:
+                return 0
+            total += score
+        return total
+
+    def score(self, key, query, fuzzy=True):
+        """Pontuação de um único programa (0 = não casa), com a mesma regra de search().
+
+        fuzzy=False quando a busca completa teve resultados exatos (e por
+        isso não caiu na busca aproximada).
+        """
+        with self._lock:
+            doc = self._docs.get(key)
+            terms = normalize(query).split()
+            if doc is None or not terms:
+                return 0
+            score = self._score(doc, terms)
+            if not score and fuzzy:
+                score = self._fuzzy_score(key, normalize(query).strip())
+            return score
+
+    def _fuzzy_minimum(self, query_grams):
+        """Trigramas em comum exigidos na busca aproximada"""
+        return max(self.FUZZY_MIN_GRAMS, math.ceil(len(query_grams) * self.FUZZY_THRESHOLD))
+
+    def _fuzzy_score(self, key, query):
+        query_grams = word_trigrams(query)
+        if not query_grams:
+            return 0
+        grams, _ = self._grams.get(key, (set(), set()))
+        count = len(query_grams & grams)
+        if count < self._fuzzy_minimum(query_grams):
+            return 0
+        return int(self.FUZZY_MAX_SCORE * count / len(query_grams))
+
+    def search(self, query, limit=None):
+        """[(key, score)] ordenados do mais relevante para o menos"""
+        with self._lock:
+            normalized = normalize(query)
+            terms = normalized.split()
+            if not terms:
+                return []
+
+            last = self._last
+            if last and last[0] == self._version and normalized.startswith(last[1]) and \
+                    len(normalized.split()) == len(last[1].split()) and \
+                    all(len(term) >= 3 for term in last[1].split()):
+                # Consulta só ganhou letras no fim: basta refinar os candidatos anteriores.
+                # Só vale se a anterior era toda de trigramas: termos curtos casam por
+                # começo de palavra e não cobrem as substrings do termo mais longo
+                candidates = last[2]
+            else:
+                candidates = None
+                for term in sorted(terms, key=len, reverse=True):
+                    found = self._candidates(term)
+                    candidates = found if candidates is None else candidates & found
+                    if not candidates:
+                        break
+
+            docs = self._docs
+            score_doc = self._score
+            results = []
+            for key in candidates or ():
+                score = score_doc(docs[key], terms)
+                if score:
+                    results.append((key, score))
+            self._last = (self._version, normalized, {key for key, _ in results})
+
+            if not results:
+                # Busca aproximada: conta trigramas em comum com a consulta inteira
+                query_grams = word_trigrams(normalized)
+                counts = defaultdict(int)
+                for gram in query_grams:
+                    for key in self._trigrams.get(gram, ()):
+                        counts[key] += 1
+                minimum = self._fuzzy_minimum(query_grams)
+                results = [(key, int(self.FUZZY_MAX_SCORE * count / len(query_grams)))
+                           for key, count in counts.items() if count >= minimum]
+
+            results.sort(key=lambda item: (-item[1], docs[item[0]][0]))
+            return results[:limit] if limit else results
@@ -0,0 +1,47 @@
+import marshal
+import os
+
+from libby_core.paths import SNAPSHOT_FILE
+from libby_core.scanner import CategoryScan, HubSnapshot
+
+# Snapshots de outra versão do formato são ignorados
+VERSION = 1
+
+
+def _hub_id(hub_dir):
+    return os.path.normcase(os.path.abspath(hub_dir))
+
+
+def save_snapshot(hub_dir, snapshot, logos, icons, path=SNAPSHOT_FILE):
+    """Grava a última lista do Hub (marshal, troca atômica do arquivo).
+
+    logos: {pasta: (mtime, logo)}; icons: {origem: PNG do cache de ícones}.
+    """
+    data = {
+        "version": VERSION,
+        "hub_dir": _hub_id(hub_dir),
+        "categories": [(c.name, c.mtime, [tuple(p) for p in c.programs]) for c in snapshot.categories],
+        "logos": {folder: tuple(entry) for folder, entry in logos.items()},
+        "icons": dict(icons),
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp = path + ".tmp"
+    with open(temp, "wb") as f:
+        marshal.dump(data, f)
+    os.replace(temp, path)
+
+
+def load_snapshot(hub_dir, path=SNAPSHOT_FILE):
+    """(HubSnapshot, logos, icons) salvos para este Hub, ou None se não houver/for inválido"""
+    try:
+        with open(path, "rb") as f:
+            data = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != VERSION or data.get("hub_dir") != _hub_id(hub_dir):
+        return None
+    try:
+        categories = [CategoryScan(name, mtime, programs) for name, mtime, programs in data["categories"]]
+        return HubSnapshot(categories), data["logos"], data["icons"]
+    except (KeyError, TypeError, ValueError):
+        return None
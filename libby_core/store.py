@@ -0,0 +1,377 @@
+import os
+import copy
+import json
+import time
+import threading
+from collections import namedtuple
+
+from libby_core.paths import CONFIG_FILE, DATABASE_FILE
+
+# Variável de ambiente que escolhe o backend ("sqlite" ou "json")
+BACKEND_ENV = "LIBBY_METADATA_BACKEND"
+# Campos somados em vez de sobrescritos: a interface e o CLI contam execuções do mesmo programa
+COUNTER_FIELDS = ("launch_count",)
+
+# Valores especiais em commit(updates=...): REMOVE apaga o campo; Increment soma ao valor gravado
+REMOVE = object()
+Increment = namedtuple("Increment", "delta")
+
+
+def merge_fields(row, fields):
+    """Aplica as alterações campo a campo sobre o que está gravado (novo dict)"""
+    row = dict(row)
+    for field, value in fields.items():
+        if value is REMOVE:
+            row.pop(field, None)
+        elif isinstance(value, Increment):
+            row[field] = row.get(field, 0) + value.delta
+        else:
+            row[field] = value
+    return row
+
+
+class MetadataStore:
+    """Interface dos backends de metadados (configurações + program_info)"""
+
+    def load(self):
+        """Retorna (settings, program_info)"""
+        raise NotImplementedError
+
+    def commit(self, settings=None, upserts=None, deletes=(), updates=None):
+        """Grava numa única transação as configurações e os programas alterados.
+
+        upserts troca o dict inteiro do programa; updates ({key: {campo: valor}})
+        lê o que está gravado e muda só os campos dados, para a interface e o
+        CLI não apagarem as alterações um do outro. deletes vem antes dos dois.
+        """
+        raise NotImplementedError
+
+    def export_json(self, path):
+        """Exporta tudo no formato do config.json"""
+        settings, program_info = self.load()
+        data = {**settings, "program_info": program_info}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+
+    def close(self):
+        pass
+
+
+class JsonMetadataStore(MetadataStore):
+    """Backend original: um único config.json com tudo"""
+
+    def __init__(self, path=CONFIG_FILE):
+        self.path = path
+        self._settings = {}
+        self._program_info = {}
+        self._loaded = False
+        self._mtime = None
+
+    def _file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def load(self):
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._program_info = data.pop("program_info", {})
+            self._settings = data
+        self._loaded = True
+        self._mtime = self._file_mtime()
+        # Cópias: o chamador pode alterar os dicts enquanto o writer grava
+        return dict(self._settings), copy.deepcopy(self._program_info)
+
+    def commit(self, settings=None, upserts=None, deletes=(), updates=None):
+        # O arquivo é regravado inteiro: relê se nunca foi lido ou se outro
+        # processo (CLI) gravou desde então, senão apagaria o que não foi carregado
+        if not self._loaded or self._file_mtime() != self._mtime:
+            self.load()
+        # Sobre cópias: se a gravação falhar, o writer tenta o mesmo lote de novo
+        # sem os Increment já somados
+        novas = {**self._settings, **(settings or {})}
+        program_info = dict(self._program_info)
+        for key in deletes:
+            program_info.pop(key, None)
+        if upserts:
+            program_info.update(upserts)
+        for key, fields in (updates or {}).items():
+            program_info[key] = merge_fields(program_info.get(key, {}), fields)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        data = {**novas, "program_info": program_info}
+        # Grava num temporário e troca de uma vez: uma queda no meio não corrompe o arquivo
+        temp = self.path + ".tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, self.path)
+        self._settings, self._program_info = novas, program_info
+        self._mtime = self._file_mtime()
+
+
+class SqliteMetadataStore(MetadataStore):
+    """Backend SQLite em modo WAL: uma linha por programa, atualizada no lugar.
+
+    O config.json é regravado ao fechar, para o fallback JSON (banco que não
+    abre) partir do estado atual; se ele mudar fora do SQLite, volta ao banco.
+    """
+
+    def __init__(self, path=DATABASE_FILE, legacy_json=CONFIG_FILE):
+        import sqlite3
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.legacy_json = legacy_json
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS programs (key TEXT PRIMARY KEY, data TEXT NOT NULL)")
+        self._migrate_json(legacy_json)
+
+    @staticmethod
+    def _json_mtime(legacy_json):
+        try:
+            return os.stat(legacy_json).st_mtime_ns if legacy_json else None
+        except OSError:
+            return None
+
+    def _migrate_json(self, legacy_json):
+        """Importa o config.json na primeira vez e quando ele mudou depois da última
+        exportação (uma sessão no fallback JSON gravou nele); senão o banco vale"""
+        migrated = self._conn.execute("SELECT 1 FROM settings WHERE key = 'migrated_from_json'").fetchone()
+        synced = self._conn.execute("SELECT value FROM settings WHERE key = 'json_synced_mtime'").fetchone()
+        mtime = self._json_mtime(legacy_json)
+        if migrated and synced is None:
+            # Banco de antes da sincronização: o config.json é o da migração, mais velho
+            self.commit({"json_synced_mtime": mtime})
+            return
+        if migrated and (mtime is None or json.loads(synced[0]) == mtime):
+            return
+        settings, program_info = {}, {}
+        if mtime is not None:
+            try:
+                settings, program_info = JsonMetadataStore(legacy_json).load()
+            except (OSError, ValueError):
+                if migrated:
+                    return  # JSON ilegível não substitui o banco
+                settings, program_info = {}, {}
+        deletes = ()
+        if migrated:
+            # O JSON tem tudo (exportação + o que a sessão no fallback gravou)
+            deletes = [key for key, in self._conn.execute("SELECT key FROM programs")
+                       if key not in program_info]
+        settings["migrated_from_json"] = True
+        settings["json_synced_mtime"] = mtime
+        self.commit(settings, program_info, deletes)
+
+    def _sync_json(self):
+        """Regrava o config.json com o estado do banco (troca atômica) e anota o mtime"""
+        temp = self.legacy_json + ".tmp"
+        self.export_json(temp)
+        os.replace(temp, self.legacy_json)
+        self.commit({"json_synced_mtime": self._json_mtime(self.legacy_json)})
+
+    def load(self):
+        with self._lock:
+            settings = {key: json.loads(value) for key, value in
+                        self._conn.execute("SELECT key, value FROM settings")}
+            program_info = {key: json.loads(data) for key, data in
+                            self._conn.execute("SELECT key, data FROM programs")}
+        settings.pop("migrated_from_json", None)
+        settings.pop("json_synced_mtime", None)
+        return settings, program_info
+
+    def commit(self, settings=None, upserts=None, deletes=(), updates=None):
+        with self._lock:
+            cur = self._conn.cursor()
+            # IMMEDIATE: o lock de escrita vale desde a leitura dos updates (outro processo espera)
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                if settings:
+                    cur.executemany(
+                        "INSERT INTO settings (key, value) VALUES (?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                        [(key, json.dumps(value, ensure_ascii=False)) for key, value in settings.items()]
+                    )
+                if deletes:
+                    cur.executemany("DELETE FROM programs WHERE key = ?", [(key,) for key in deletes])
+                rows = dict(upserts or {})
+                for key, fields in (updates or {}).items():
+                    if key in rows:
+                        atual = rows[key]
+                    else:
+                        linha = cur.execute("SELECT data FROM programs WHERE key = ?", (key,)).fetchone()
+                        atual = json.loads(linha[0]) if linha else {}
+                    rows[key] = merge_fields(atual, fields)
+                if rows:
+                    cur.executemany(
+                        "INSERT INTO programs (key, data) VALUES (?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET data = excluded.data",
+                        [(key, json.dumps(data, ensure_ascii=False)) for key, data in rows.items()]
+                    )
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+
+    def close(self):
+        import sqlite3
+
+        if self.legacy_json:
+            try:
+                self._sync_json()
+            except (OSError, sqlite3.Error):
+                pass  # fica o config.json anterior; o banco continua valendo
+        with self._lock:
+            self._conn.close()
+
+
+class DebouncedWriter:
+    """Acumula alterações de metadados e grava em background.
+
+    Cada alteração adia a gravação por `delay` segundos (até no máximo
+    `max_delay` desde a primeira pendência), então uma sequência de cliques
+    vira uma única transação no store.
+
+    put() recebe o dict inteiro do programa, mas só os campos que mudaram
+    desde o último put (ou desde `known`, o que foi carregado) vão para o
+    store, mesclados com o que estiver gravado: o que o CLI gravou nos
+    outros campos é mantido, e COUNTER_FIELDS viram somas.
+    """
+
+    def __init__(self, store, delay=0.5, max_delay=5.0, on_error=None, known=None):
+        self.store = store
+        self.delay = delay
+        self.max_delay = max_delay
+        self.on_error = on_error
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._known = copy.deepcopy(known or {})
+        self._settings = {}
+        self._updates = {}
+        self._deletes = set()
+        self._first_mark = None
+        self._deadline = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="libby-config-writer", daemon=True)
+        self._thread.start()
+
+    def set_settings(self, **settings):
+        with self._cond:
+            self._settings.update(settings)
+            self._mark()
+
+    def put(self, key, data):
+        with self._cond:
+            antes = self._known.get(key, {})
+            fields = self._updates.setdefault(key, {})
+            for field, value in data.items():
+                if field in antes and antes[field] == value:
+                    continue
+                if field in COUNTER_FIELDS and isinstance(value, int) and isinstance(antes.get(field, 0), int):
+                    pendente = fields.get(field)
+                    soma = pendente.delta if isinstance(pendente, Increment) else 0
+                    fields[field] = Increment(soma + value - antes.get(field, 0))
+                else:
+                    fields[field] = copy.deepcopy(value)
+            for field in antes:
+                if field not in data:
+                    fields[field] = REMOVE
+            self._known[key] = copy.deepcopy(data)
+            self._mark()
+
+    def delete(self, key):
+        with self._cond:
+            self._updates.pop(key, None)
+            self._known.pop(key, None)
+            self._deletes.add(key)
+            self._mark()
+
+    def _mark(self):
+        agora = time.monotonic()
+        if self._first_mark is None:
+            self._first_mark = agora
+        self._deadline = min(agora + self.delay, self._first_mark + self.max_delay)
+        self._cond.notify()
+
+    def _pending(self):
+        return bool(self._settings or self._updates or self._deletes)
+
+    def _take(self):
+        batch = (self._settings, self._updates, self._deletes)
+        self._settings, self._updates, self._deletes = {}, {}, set()
+        self._first_mark = self._deadline = None
+        return batch
+
+    def _restore(self, batch):
+        """Devolve um lote que falhou sem sobrescrever alterações mais novas"""
+        settings, updates, deletes = batch
+        for key, value in settings.items():
+            self._settings.setdefault(key, value)
+        for key, fields in updates.items():
+            if key in self._deletes:
+                continue  # apagado depois da falha
+            novos = self._updates.setdefault(key, {})
+            for field, value in fields.items():
+                if field not in novos:
+                    novos[field] = value
+                elif isinstance(value, Increment) and isinstance(novos[field], Increment):
+                    novos[field] = Increment(value.delta + novos[field].delta)
+        # Apagar antes dos updates (commit faz nessa ordem) continua certo
+        self._deletes.update(deletes)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and (not self._pending() or time.monotonic() < self._deadline):
+                    self._cond.wait(None if not self._pending() else self._deadline - time.monotonic())
+                if self._closed:
+                    return
+            self.flush()
+
+    def flush(self):
+        """Grava imediatamente o que estiver pendente (na thread chamadora)"""
+        with self._write_lock:
+            with self._cond:
+                if not self._pending():
+                    return True
+                batch = self._take()
+            try:
+                settings, updates, deletes = batch
+                self.store.commit(settings, deletes=deletes, updates=updates)
+                return True
+            except Exception as e:
+                with self._cond:
+                    self._restore(batch)
+                    if not self._closed:
+                        # Tenta de novo mais tarde
+                        self._first_mark = time.monotonic()
+                        self._deadline = self._first_mark + self.max_delay
+                if self.on_error:
+                    self.on_error(e)
+                return False
+
+    def close(self):
+        """Para a thread e faz a gravação final forçada"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        return self.flush()
+
+
+def open_store(backend=None):
+    """Abre o backend configurado (SQLite por padrão, JSON como alternativa)"""
+    backend = (backend or os.environ.get(BACKEND_ENV) or "sqlite").lower()
+    if backend == "sqlite":
+        try:
+            return SqliteMetadataStore()
+        except ImportError:
+            # Python sem sqlite3: mantém o config.json
+            pass
+    return JsonMetadataStore()